@@ -1,5 +1,9 @@
 """Configuration for Penpot MCP server."""
 
+import os
+from functools import cached_property, lru_cache
+from typing import Any
+
 from pydantic_settings import BaseSettings
 
 
@@ -21,11 +25,14 @@ class Settings(BaseSettings):
     penpot_db_name: str = "penpot"
     penpot_db_user: str = "penpot"
     penpot_db_pass: str = ""
+    penpot_db_pool_min: int = 5
+    penpot_db_pool_max: int = 20
 
     # MCP Server
     mcp_host: str = "0.0.0.0"
     mcp_port: int = 8787
     mcp_log_level: str = "info"
+    mcp_pretty_json: bool = False
 
     # WebSocket / Plugin channel
     ws_host: str = "0.0.0.0"
@@ -34,7 +41,7 @@ class Settings(BaseSettings):
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
-    @property
+    @cached_property
     def db_dsn(self) -> str:
         return (
             f"postgresql://{self.penpot_db_user}:{self.penpot_db_pass}"
@@ -50,4 +57,21 @@ class Settings(BaseSettings):
         return bool(self.penpot_email and self.penpot_password)
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings once per process and reuse the instance.
+
+    ``PENPOT_MCP_ENV_FILE`` overrides the dotenv path; set it to an empty
+    string to skip file parsing when the environment is fully provided
+    by the orchestrator (e.g. Docker).
+    """
+    env_file = os.environ.get("PENPOT_MCP_ENV_FILE", ".env") or None
+    return Settings(_env_file=env_file)
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `from penpot_mcp.config import settings` working without reading
+    # the environment as an import side effect.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
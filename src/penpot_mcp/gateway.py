@@ -6,32 +6,116 @@ an AI intent via Database/RPC calls (headless) or WebSocket (interactive).
 
 from __future__ import annotations
 
+import contextlib
+import contextvars
+import functools
+import importlib
 import logging
+import sys
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from types import MappingProxyType
+from typing import Any, Final
 
 logger = logging.getLogger(__name__)
+_log_debug = logger.debug
+
+# Known intent names. Callers pass these (interned) constants so the route
+# table probe short-circuits on identity instead of comparing strings.
+INTENT_GET_PAGE_OBJECTS: Final[str] = sys.intern("get_page_objects")
+INTENT_GET_SHAPE_TREE: Final[str] = sys.intern("get_shape_tree")
+
+# Snapshot of the plugin channel: (is_connected, active_selection). Pinned by
+# PenpotGateway.ws_snapshot() so every check made inside that block sees the
+# same state without re-reading the controller.
+_ws_state: contextvars.ContextVar[tuple[bool, tuple[str, ...]] | None] = (
+    contextvars.ContextVar("penpot_ws_state", default=None)
+)
+
+# Intent name → (module, attribute) of the DB/API implementation.
+# The set of intents is closed, so the table is frozen at import time.
+_ROUTE_TARGETS: Mapping[str, tuple[str, str]] = MappingProxyType(
+    {
+        INTENT_GET_PAGE_OBJECTS: ("penpot_mcp.tools.shapes", "get_page_objects"),
+        INTENT_GET_SHAPE_TREE: ("penpot_mcp.tools.shapes", "get_shape_tree"),
+    }
+)
+
+# Intent name → resolved coroutine function, filled in by _resolve().
+_INTENT_ROUTES: dict[str, Callable[..., Awaitable[Any]]] = {}
+
+
+@functools.cache
+def _resolve(intent_name: str) -> Callable[..., Awaitable[Any]]:
+    """Import the handler for an intent once and register it in the route table."""
+    target = _ROUTE_TARGETS.get(intent_name)
+    if target is None:
+        raise NotImplementedError(f"Gateway has no route for intent: {intent_name}")
+    module_name, attr = target
+    handler = getattr(importlib.import_module(module_name), attr)
+    _INTENT_ROUTES[intent_name] = handler
+    return handler
 
 
 class PenpotGateway:
     """Intelligent router that decides the execution path (WS vs DB/API)."""
 
+    __slots__ = ("_ws_controller",)
+
     def __init__(self):
-        # We will initialize the WS controller here later
-        from penpot_mcp.ws_controller import ws_controller
+        self._ws_controller = None
+
+    @property
+    def _ws(self):
+        """The plugin WS controller, imported on first use.
+
+        Headless requests never touch it, so the websockets stack is only
+        loaded once something actually asks about the interactive channel.
+        """
+        if self._ws_controller is None:
+            from penpot_mcp.ws_controller import ws_controller
 
-        self._ws = ws_controller
+            self._ws_controller = ws_controller
+        return self._ws_controller
+
+    def _read_ws(self) -> tuple[bool, tuple[str, ...]]:
+        """Read the controller state, copying the selection into a tuple."""
+        return self._ws.is_connected, tuple(self._ws.active_selection)
+
+    def _ws_snapshot(self) -> tuple[bool, tuple[str, ...]]:
+        """Return the pinned WS state, reading the controller if unset."""
+        state = _ws_state.get()
+        if state is None:
+            state = self._read_ws()
+        return state
+
+    @contextlib.contextmanager
+    def ws_snapshot(self) -> Iterator[None]:
+        """Pin the plugin channel state for the duration of the block.
+
+        Only code that reads is_interactive/active_selection needs this;
+        headless dispatch never touches the WS controller.
+        """
+        token = _ws_state.set(self._read_ws())
+        try:
+            yield
+        finally:
+            _ws_state.reset(token)
 
     @property
     def is_interactive(self) -> bool:
         """Returns True if the user is actively connected via the Plugin WebSocket."""
-        return self._ws.is_connected
+        return self._ws_snapshot()[0]
 
     @property
-    def active_selection(self) -> list[str]:
+    def active_selection(self) -> tuple[str, ...]:
         """Returns the UUIDs of the shapes currently selected by the user."""
-        return self._ws.active_selection
+        return self._ws_snapshot()[1]
 
-    async def execute_intent(self, intent_name: str, **kwargs):
-        """Execute an AI intent using the most effective path.
+    def dispatch(self, intent_name: str, **kwargs) -> Awaitable[Any]:
+        """Route an AI intent and return the handler's awaitable.
+
+        The routing itself is synchronous; the caller awaits the returned
+        coroutine directly, so no extra coroutine frame wraps the handler.
 
         Args:
             intent_name: Logical identity of the operation (e.g. 'get_page_objects')
@@ -39,21 +123,28 @@ class PenpotGateway:
         """
         # For Phase 1, we just fallback immediately to the DB/API implementations
         # which are currently located in penpot_mcp.tools.*
+        handler = _INTENT_ROUTES.get(intent_name) or _resolve(intent_name)
+        if logger.isEnabledFor(logging.DEBUG):
+            _log_debug("Routing intent %s via DB/API", intent_name)
+        return handler(**kwargs)
 
-        # Example routing (to be expanded):
-        if intent_name == "get_page_objects":
-            from penpot_mcp.tools.shapes import get_page_objects
-
-            return await get_page_objects(**kwargs)
+    async def execute_intent(self, intent_name: str, **kwargs):
+        """Execute an AI intent using the most effective path.
 
-        elif intent_name == "get_shape_tree":
-            from penpot_mcp.tools.shapes import get_shape_tree
+        Thin async wrapper around dispatch() kept for existing callers.
+        """
+        return await self.dispatch(intent_name, **kwargs)
 
-            return await get_shape_tree(**kwargs)
 
-        else:
-            raise NotImplementedError(f"Gateway has no route for intent: {intent_name}")
+@functools.lru_cache(maxsize=1)
+def get_gateway() -> PenpotGateway:
+    """Return the central gateway instance, creating it on first use."""
+    return PenpotGateway()
 
 
-# Central singleton instance
-gateway = PenpotGateway()
+def __getattr__(name: str) -> Any:
+    # Keep `from penpot_mcp.gateway import gateway` working without
+    # constructing the singleton as an import side effect.
+    if name == "gateway":
+        return get_gateway()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,20 +2,173 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
+import gzip
+import hashlib
+import inspect
 import logging
-from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
+from typing import Any, Literal, NamedTuple, get_type_hints
 
+import asyncpg
+import httpx
+import orjson
 from mcp.server.fastmcp import FastMCP
-from starlette.responses import FileResponse, JSONResponse
+from mcp.server.fastmcp.exceptions import ToolError
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
 from penpot_mcp.config import settings
+from penpot_mcp.gateway import (
+    INTENT_GET_PAGE_OBJECTS,
+    INTENT_GET_SHAPE_TREE,
+    get_gateway,
+)
 from penpot_mcp.services.api import api
+from penpot_mcp.services.cache import ResponseCache
 from penpot_mcp.services.db import db
+from penpot_mcp.tools import advanced as _advanced
+from penpot_mcp.tools import comments as _comments
+from penpot_mcp.tools import components as _components
+from penpot_mcp.tools import create as _create
+from penpot_mcp.tools import database as _database
+from penpot_mcp.tools import export as _export
+from penpot_mcp.tools import files as _files
+from penpot_mcp.tools import media as _media
+from penpot_mcp.tools import modify as _modify
+from penpot_mcp.tools import projects as _projects
+from penpot_mcp.tools import shapes as _shapes
+from penpot_mcp.tools import text as _text
+from penpot_mcp.transformers.css import shape_to_css_string
+from penpot_mcp.transformers.svg import shape_to_svg
+from penpot_mcp.ws_controller import ws_controller
 
 logger = logging.getLogger(__name__)
 
+# Compact by default — clients are programs; indent only when debugging.
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | (
+    orjson.OPT_INDENT_2 if settings.mcp_pretty_json else 0
+)
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode the few types orjson doesn't handle natively (UUID/datetime are native)."""
+    if isinstance(obj, asyncpg.Record):
+        return dict(obj)
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return f"<binary {len(obj)} bytes>"
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    # Decimal (Postgres numeric) included: clients have always received a string
+    return str(obj)
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result to JSON."""
+    return orjson.dumps(obj, default=_json_default, option=_DUMPS_OPTIONS).decode()
+
+
+# Results bigger than this (see _size_hint) are encoded off the event loop.
+_OFFLOAD_MIN_ITEMS = 500
+
+
+def _size_hint(obj: Any) -> int:
+    """Cheap proxy for payload size: entry count of the outer containers."""
+    if isinstance(obj, list):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sum(len(v) if isinstance(v, (list, dict)) else 1 for v in obj.values())
+    return 0
+
+
+async def _stream_json_array(items: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """Encode an async iterator as a JSON array, one element per chunk."""
+    yield b"["
+    first = True
+    async for item in items:
+        if not first:
+            yield b","
+        first = False
+        yield orjson.dumps(
+            item, default=_json_default, option=orjson.OPT_NON_STR_KEYS
+        )
+    yield b"]"
+
+
+async def _dumps_large(obj: Any) -> str:
+    """Serialize a potentially large result without blocking other tool calls."""
+    if _size_hint(obj) < _OFFLOAD_MIN_ITEMS:
+        return _dumps(obj)
+    return await asyncio.to_thread(_dumps, obj)
+
+
+# Responses derived from file data, valid until the file's revn changes.
+_file_cache = ResponseCache(maxsize=256)
+# Team/project/file metadata: short TTL, and cleared by every write tool,
+# since file summaries carry counts (comments, media) that revn doesn't track.
+_meta_cache = ResponseCache(maxsize=256, ttl=30.0)
+
+
+def _wrap_tool(
+    fn: Callable[..., Awaitable[Any]],
+    *,
+    cache: Literal["revn", "ttl"] | None = None,
+    invalidates: bool = False,
+) -> Callable[..., Awaitable[str]]:
+    """Expose a tools.* coroutine as an MCP tool that returns JSON text.
+
+    The wrapper carries over the function's name, docstring and parameters
+    (with type hints resolved) so FastMCP derives the same tool schema.
+
+    Args:
+        fn: The tool implementation.
+        cache: "revn" caches the JSON per (args, current file revn) — the
+            function must take a ``file_id``; "ttl" caches it in the
+            short-lived metadata cache.
+        invalidates: Clear the metadata cache after the call (for any write
+            to teams, projects, files or their contents).
+    """
+    hints = get_type_hints(fn)
+    sig = inspect.signature(fn)
+    params = [
+        p.replace(annotation=hints.get(p.name, p.annotation))
+        for p in sig.parameters.values()
+    ]
+
+    @functools.wraps(fn)
+    async def tool(*args: Any, **kwargs: Any) -> str:
+        if cache is None:
+            result = await _dumps_large(await fn(*args, **kwargs))
+            if invalidates:
+                _meta_cache.clear()
+            return result
+
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key: tuple = (fn.__name__, *bound.arguments.values())
+        store = _meta_cache
+        if cache == "revn":
+            revn = await db.fetchval(
+                "SELECT revn FROM file WHERE id = $1", bound.arguments["file_id"]
+            )
+            if revn is None:
+                return await _dumps_large(await fn(*args, **kwargs))
+            key += (revn,)
+            store = _file_cache
+
+        cached = store.get(key)
+        if cached is None:
+            cached = await _dumps_large(await fn(*args, **kwargs))
+            store.set(key, cached)
+        return cached
+
+    tool.__signature__ = sig.replace(parameters=params, return_annotation=str)
+    tool.__annotations__ = {p.name: p.annotation for p in params} | {"return": str}
+    return tool
+
 
 mcp = FastMCP(
     "Penpot MCP",
@@ -28,16 +181,25 @@ mcp = FastMCP(
     port=settings.mcp_port,
 )
 
+# Tools return pre-encoded JSON text. With structured output on, FastMCP would
+# also echo every response as {"result": "<same JSON, escaped>"} in
+# structuredContent, doubling the encode work and the payload.
+_tool = functools.partial(mcp.tool, structured_output=False)
+
 
 # ═══════════════════════════════════════════════════════════════
 # Root health check
 # ═══════════════════════════════════════════════════════════════
 
 
+# Probes hit this constantly; the body never changes, so encode it once.
+_HEALTH_BYTES = orjson.dumps({"service": "Penpot MCP", "status": "ok", "version": "0.1.0"})
+
+
 @mcp.custom_route("/", methods=["GET"])
 async def root(request):
     """Root health check endpoint."""
-    return JSONResponse({"service": "Penpot MCP", "status": "ok", "version": "0.1.0"})
+    return Response(_HEALTH_BYTES, media_type="application/json")
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -47,260 +209,195 @@ async def root(request):
 
 _PLUGIN_DIR = Path(__file__).parent / "plugin"
 
-
-@mcp.custom_route("/plugin/manifest.json", methods=["GET", "OPTIONS"])
-async def plugin_manifest(request):
-    """Serve the Penpot plugin manifest."""
-    if request.method == "OPTIONS":
-        from starlette.responses import Response
-        return Response(
-            status_code=204,
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, OPTIONS",
-            },
-        )
-    return FileResponse(
-        _PLUGIN_DIR / "manifest.json",
-        media_type="application/json",
-        headers={"Access-Control-Allow-Origin": "*"},
+_PLUGIN_MEDIA_TYPES = {
+    "manifest.json": "application/json",
+    "plugin.js": "application/javascript",
+    "ui.html": "text/html",
+}
+
+
+class _PluginAsset(NamedTuple):
+    body: bytes
+    etag: str
+    gzip_body: bytes | None  # None when compression doesn't pay off
+    gzip_etag: str
+    media_type: str
+
+
+def _load_plugin_asset(name: str) -> _PluginAsset:
+    """Read a plugin file once, pre-compress it and compute its ETags."""
+    path = _PLUGIN_DIR / name
+    body = path.read_bytes()
+    digest = hashlib.md5(body).hexdigest()
+    gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+    return _PluginAsset(
+        body=body,
+        etag=f'"{digest}"',
+        gzip_body=gzip_body if len(gzip_body) < len(body) else None,
+        gzip_etag=f'"{digest}-gzip"',
+        media_type=_PLUGIN_MEDIA_TYPES[name],
     )
 
 
-@mcp.custom_route("/plugin/plugin.js", methods=["GET", "OPTIONS"])
-async def plugin_js(request):
-    """Serve the Penpot plugin JavaScript."""
-    if request.method == "OPTIONS":
-        from starlette.responses import Response
-        return Response(
-            status_code=204,
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, OPTIONS",
-            },
-        )
-    return FileResponse(
-        _PLUGIN_DIR / "plugin.js",
-        media_type="application/javascript",
-        headers={"Access-Control-Allow-Origin": "*"},
-    )
+# Plugin assets are immutable per deploy — read them once at import.
+_PLUGIN_ASSETS: dict[str, _PluginAsset] = {
+    name: _load_plugin_asset(name) for name in _PLUGIN_MEDIA_TYPES
+}
 
 
-@mcp.custom_route("/plugin/ui.html", methods=["GET", "OPTIONS"])
-async def plugin_ui(request):
-    """Serve the Penpot plugin UI panel."""
-    if request.method == "OPTIONS":
-        from starlette.responses import Response
-        return Response(
-            status_code=204,
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, OPTIONS",
-            },
-        )
-    return FileResponse(
-        _PLUGIN_DIR / "ui.html",
-        media_type="text/html",
-        headers={"Access-Control-Allow-Origin": "*"},
-    )
+class _PluginCORSMiddleware:
+    """Allow cross-origin GETs of the /plugin/* assets only.
 
+    The browser plugin fetches them from the Penpot origin. Every other
+    route (MCP, streaming, export) acts with the server's own Penpot
+    credentials, so it stays same-origin.
+    """
 
-@mcp.custom_route("/plugin/config.json", methods=["GET", "OPTIONS"])
-async def plugin_config(request):
-    """Serve dynamic plugin configuration (WebSocket URL)."""
-    if request.method == "OPTIONS":
-        from starlette.responses import Response
-        return Response(
-            status_code=204,
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, OPTIONS",
-            },
+    def __init__(self, app) -> None:
+        self.app = app
+        self.cors = CORSMiddleware(
+            app,
+            allow_origins=["*"],
+            allow_methods=["GET", "OPTIONS"],
+            max_age=86400,
         )
-    return JSONResponse(
-        {"ws_url": settings.plugin_ws_url, "version": "1.0.0"},
-        headers={"Access-Control-Allow-Origin": "*"},
-    )
 
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith("/plugin/"):
+            await self.cors(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
 
-# ═══════════════════════════════════════════════════════════════
-# Category 1: Projects & Teams
-# ═══════════════════════════════════════════════════════════════
-
-
-@mcp.tool()
-async def list_teams() -> str:
-    """List all teams in the Penpot instance with member and project counts."""
-    from penpot_mcp.tools.projects import list_teams as _list_teams
-
-    result = await _list_teams()
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def list_projects(team_id: str | None = None) -> str:
-    """List projects, optionally filtered by team ID.
-
-    Args:
-        team_id: Filter by team UUID. Omit to list all projects.
-    """
-    from penpot_mcp.tools.projects import list_projects as _list_projects
-
-    result = await _list_projects(team_id)
-    return json.dumps(result, indent=2)
 
+# Settings don't change at runtime, so the config body is encoded once.
+_PLUGIN_CONFIG_BYTES = orjson.dumps(
+    {"ws_url": settings.plugin_ws_url, "version": "1.0.0"}
+)
+_PLUGIN_CONFIG_ETAG = f'"{hashlib.md5(_PLUGIN_CONFIG_BYTES).hexdigest()}"'
 
-@mcp.tool()
-async def list_files(project_id: str) -> str:
-    """List all files in a project.
 
-    Args:
-        project_id: The project UUID.
-    """
-    from penpot_mcp.tools.projects import list_files as _list_files
-
-    result = await _list_files(project_id)
-    return json.dumps(result, indent=2)
+# Registered before the catch-all asset route so it wins the match.
+@mcp.custom_route("/plugin/config.json", methods=["GET"])
+async def plugin_config(request):
+    """Serve dynamic plugin configuration (WebSocket URL)."""
+    headers = {
+        "ETag": _PLUGIN_CONFIG_ETAG,
+        "Cache-Control": "public, max-age=60",
+    }
+    if request.headers.get("if-none-match") == _PLUGIN_CONFIG_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        _PLUGIN_CONFIG_BYTES, media_type="application/json", headers=headers
+    )
 
 
-@mcp.tool()
-async def search_files(query: str) -> str:
-    """Search files by name across all projects.
+@mcp.custom_route("/plugin/{name}", methods=["GET"])
+async def plugin_asset(request):
+    """Serve the Penpot plugin files (manifest, JavaScript, UI panel)."""
 
-    Args:
-        query: Search term (case-insensitive partial match).
-    """
-    from penpot_mcp.tools.projects import search_files as _search_files
+    name = request.path_params["name"]
+    asset = _PLUGIN_ASSETS.get(name)
+    if asset is None:
+        return Response(status_code=404)
 
-    result = await _search_files(query)
-    return json.dumps(result, indent=2)
+    use_gzip = asset.gzip_body is not None and "gzip" in request.headers.get(
+        "accept-encoding", ""
+    )
+    etag = asset.gzip_etag if use_gzip else asset.etag
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=86400",
+        "Vary": "Accept-Encoding",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(asset.gzip_body, media_type=asset.media_type, headers=headers)
+    return Response(asset.body, media_type=asset.media_type, headers=headers)
 
 
 # ═══════════════════════════════════════════════════════════════
-# Category 2: File Operations
+# Streaming: large listings as chunked JSON arrays over plain HTTP
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
-async def get_file_summary(file_id: str) -> str:
-    """Get detailed metadata for a file (counts, team, project, versions).
-
-    Args:
-        file_id: The file UUID.
-    """
-    from penpot_mcp.tools.files import get_file_summary as _get_file_summary
-
-    result = await _get_file_summary(file_id)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def get_file_pages(file_id: str) -> str:
-    """Get all pages in a file with their object counts.
-
-    Args:
-        file_id: The file UUID.
-    """
-    from penpot_mcp.tools.files import get_file_pages as _get_file_pages
-
-    result = await _get_file_pages(file_id)
-    return json.dumps(result, indent=2)
-
+@mcp.custom_route("/stream/page-objects", methods=["GET"])
+async def stream_page_objects(request):
+    """Stream a page's objects (same items as get_page_objects) as a JSON array.
 
-@mcp.tool()
-async def get_file_history(file_id: str, limit: int = 20) -> str:
-    """Get revision history of a file.
-
-    Args:
-        file_id: The file UUID.
-        limit: Max entries to return (default 20).
+    Query params: file_id, page_id, optional shape_type.
     """
-    from penpot_mcp.tools.files import get_file_history as _get_file_history
-
-    result = await _get_file_history(file_id, limit)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def get_file_libraries(file_id: str) -> str:
-    """List shared libraries linked to a file.
-
-    Args:
-        file_id: The file UUID.
-    """
-    from penpot_mcp.tools.files import get_file_libraries as _get_file_libraries
-
-    result = await _get_file_libraries(file_id)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def create_project(team_id: str, name: str) -> str:
-    """Create a new project in a team.
+    params = request.query_params
+    file_id = params.get("file_id")
+    page_id = params.get("page_id")
+    if not file_id or not page_id:
+        return JSONResponse(
+            {"error": "file_id and page_id are required"}, status_code=400
+        )
+    items = _shapes.iter_page_objects(file_id, page_id, params.get("shape_type"))
+    return StreamingResponse(
+        _stream_json_array(items), media_type="application/json"
+    )
 
-    Args:
-        team_id: The team UUID.
-        name: Project name.
-    """
-    from penpot_mcp.tools.files import create_project as _create_project
 
-    result = await _create_project(team_id, name)
-    return json.dumps(result, indent=2, default=str)
+# ═══════════════════════════════════════════════════════════════
+# Export: raw PNG bytes, skipping the base64 round-trip of the tool
+# ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
-async def create_file(project_id: str, name: str) -> str:
-    """Create a new design file in a project.
+@mcp.custom_route("/export/png/{file_id}/{page_id}/{object_id}", methods=["GET"])
+async def export_png(request):
+    """Render a frame or shape to PNG (same as export_frame_png) as image/png.
 
-    Args:
-        project_id: The project UUID.
-        name: File name.
+    Query params: optional scale (default 1.0).
     """
-    from penpot_mcp.tools.files import create_file as _create_file
-
-    result = await _create_file(project_id, name)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def rename_file(file_id: str, name: str) -> str:
-    """Rename an existing file.
-
-    Args:
-        file_id: The file UUID.
-        name: New name.
-    """
-    from penpot_mcp.tools.files import rename_file as _rename_file
+    try:
+        scale = float(request.query_params.get("scale", 1.0))
+    except ValueError:
+        return JSONResponse({"error": "scale must be a number"}, status_code=400)
+    p = request.path_params
+    try:
+        chunks = await api.export_object_stream(
+            p["file_id"], p["page_id"], p["object_id"], "png", scale
+        )
+    except (httpx.HTTPError, ValueError) as e:
+        # ValueError: an id that isn't a UUID
+        logger.warning("PNG export failed: %s", e)
+        return JSONResponse({"error": f"Export failed: {e}"}, status_code=502)
+    # Relayed chunk by chunk, so large renders never sit in memory here
+    return StreamingResponse(
+        chunks,
+        media_type="image/png",
+        headers={"Cache-Control": "private, max-age=60"},
+    )
 
-    result = await _rename_file(file_id, name)
-    return json.dumps(result, indent=2, default=str)
 
+# ═══════════════════════════════════════════════════════════════
+# Category 1: Projects & Teams
+# ═══════════════════════════════════════════════════════════════
 
-@mcp.tool()
-async def duplicate_file(file_id: str, name: str | None = None) -> str:
-    """Duplicate an existing file.
 
-    Args:
-        file_id: The file UUID.
-        name: Optional name for the copy.
-    """
-    from penpot_mcp.tools.files import duplicate_file as _duplicate_file
+list_teams = _tool()(_wrap_tool(_projects.list_teams, cache="ttl"))
+list_projects = _tool()(_wrap_tool(_projects.list_projects, cache="ttl"))
+list_files = _tool()(_wrap_tool(_projects.list_files))
+search_files = _tool()(_wrap_tool(_projects.search_files))
 
-    result = await _duplicate_file(file_id, name)
-    return json.dumps(result, indent=2, default=str)
 
+# ═══════════════════════════════════════════════════════════════
+# Category 2: File Operations
+# ═══════════════════════════════════════════════════════════════
 
-@mcp.tool()
-async def delete_file(file_id: str) -> str:
-    """Delete a file (moves to trash).
 
-    Args:
-        file_id: The file UUID.
-    """
-    from penpot_mcp.tools.files import delete_file as _delete_file
-
-    result = await _delete_file(file_id)
-    return json.dumps(result, indent=2, default=str)
+get_file_summary = _tool()(_wrap_tool(_files.get_file_summary, cache="ttl"))
+get_file_pages = _tool()(_wrap_tool(_files.get_file_pages, cache="revn"))
+get_file_history = _tool()(_wrap_tool(_files.get_file_history))
+get_file_libraries = _tool()(_wrap_tool(_files.get_file_libraries))
+create_project = _tool()(_wrap_tool(_files.create_project, invalidates=True))
+create_file = _tool()(_wrap_tool(_files.create_file, invalidates=True))
+rename_file = _tool()(_wrap_tool(_files.rename_file, invalidates=True))
+duplicate_file = _tool()(_wrap_tool(_files.duplicate_file, invalidates=True))
+delete_file = _tool()(_wrap_tool(_files.delete_file, invalidates=True))
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -308,7 +405,7 @@ async def delete_file(file_id: str) -> str:
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
+@_tool()
 async def get_page_objects(
     file_id: str, page_id: str, shape_type: str | None = None
 ) -> str:
@@ -319,15 +416,13 @@ async def get_page_objects(
         page_id: The page UUID.
         shape_type: Filter — rect, circle, frame, text, group, path, image, svg-raw, bool.
     """
-    from penpot_mcp.gateway import gateway
-
-    result = await gateway.execute_intent(
-        "get_page_objects", file_id=file_id, page_id=page_id, shape_type=shape_type
+    result = await get_gateway().dispatch(
+        INTENT_GET_PAGE_OBJECTS, file_id=file_id, page_id=page_id, shape_type=shape_type
     )
-    return json.dumps(result, indent=2)
+    return await _dumps_large(result)
 
 
-@mcp.tool()
+@_tool()
 async def get_shape_tree(
     file_id: str, page_id: str, root_id: str | None = None, depth: int = 3
 ) -> str:
@@ -339,48 +434,17 @@ async def get_shape_tree(
         root_id: Start from this shape ID (omit for page root).
         depth: Max tree depth (default 3).
     """
-    from penpot_mcp.gateway import gateway
-
-    result = await gateway.execute_intent(
-        "get_shape_tree", file_id=file_id, page_id=page_id, root_id=root_id, depth=depth
+    result = await get_gateway().dispatch(
+        INTENT_GET_SHAPE_TREE, file_id=file_id, page_id=page_id, root_id=root_id, depth=depth
     )
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def get_shape_details(file_id: str, page_id: str, shape_id: str) -> str:
-    """Get full details of a specific shape (fills, strokes, layout, text content).
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The shape UUID.
-    """
-    from penpot_mcp.tools.shapes import get_shape_details as _get_shape_details
-
-    result = await _get_shape_details(file_id, page_id, shape_id)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def search_shapes(
-    file_id: str, page_id: str, query: str, search_type: str = "name"
-) -> str:
-    """Search shapes by name or text content on a page.
+    return await _dumps_large(result)
 
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        query: Search term (case-insensitive).
-        search_type: "name" or "text".
-    """
-    from penpot_mcp.tools.shapes import search_shapes as _search_shapes
 
-    result = await _search_shapes(file_id, page_id, query, search_type)
-    return json.dumps(result, indent=2)
+get_shape_details = _tool()(_wrap_tool(_shapes.get_shape_details))
+search_shapes = _tool()(_wrap_tool(_shapes.search_shapes))
 
 
-@mcp.tool()
+@_tool()
 async def get_shape_css(file_id: str, page_id: str, shape_id: str) -> str:
     """Get CSS representation of a shape's visual properties.
 
@@ -392,19 +456,14 @@ async def get_shape_css(file_id: str, page_id: str, shape_id: str) -> str:
         page_id: The page UUID.
         shape_id: The shape UUID.
     """
-    from penpot_mcp.tools.shapes import get_shape_details as _get_shape_details
-    from penpot_mcp.transformers.css import shape_to_css_string
-
-    shape = await _get_shape_details(file_id, page_id, shape_id)
+    shape = await _shapes.get_shape_details(file_id, page_id, shape_id)
     if "error" in shape:
-        return json.dumps(shape)
+        return _dumps(shape)
     css = shape_to_css_string(shape)
-    return json.dumps(
-        {"shape_id": shape_id, "name": shape.get("name"), "css": css}, indent=2
-    )
+    return _dumps({"shape_id": shape_id, "name": shape.get("name"), "css": css})
 
 
-@mcp.tool()
+@_tool()
 async def get_shape_svg(file_id: str, page_id: str, shape_id: str) -> str:
     """Get SVG representation of a shape.
 
@@ -415,16 +474,11 @@ async def get_shape_svg(file_id: str, page_id: str, shape_id: str) -> str:
         page_id: The page UUID.
         shape_id: The shape UUID.
     """
-    from penpot_mcp.tools.shapes import get_shape_details as _get_shape_details
-    from penpot_mcp.transformers.svg import shape_to_svg
-
-    shape = await _get_shape_details(file_id, page_id, shape_id)
+    shape = await _shapes.get_shape_details(file_id, page_id, shape_id)
     if "error" in shape:
-        return json.dumps(shape)
+        return _dumps(shape)
     svg = shape_to_svg(shape)
-    return json.dumps(
-        {"shape_id": shape_id, "name": shape.get("name"), "svg": svg}, indent=2
-    )
+    return _dumps({"shape_id": shape_id, "name": shape.get("name"), "svg": svg})
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -432,56 +486,16 @@ async def get_shape_svg(file_id: str, page_id: str, shape_id: str) -> str:
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
-async def get_component_instances(file_id: str) -> str:
-    """List all components defined in a file.
-
-    Args:
-        file_id: The file UUID.
-    """
-    from penpot_mcp.tools.components import get_component_instances as _get_components
-
-    result = await _get_components(file_id)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def get_design_tokens(file_id: str) -> str:
-    """Get consolidated design tokens (colors, typographies, component count) from a file.
-
-    Args:
-        file_id: The file UUID.
-    """
-    from penpot_mcp.tools.components import get_design_tokens as _get_design_tokens
-
-    result = await _get_design_tokens(file_id)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def get_colors_library(file_id: str) -> str:
-    """Get all colors defined in a file's library.
-
-    Args:
-        file_id: The file UUID.
-    """
-    from penpot_mcp.tools.components import get_colors_library as _get_colors
-
-    result = await _get_colors(file_id)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def get_typography_library(file_id: str) -> str:
-    """Get all typographies defined in a file's library.
-
-    Args:
-        file_id: The file UUID.
-    """
-    from penpot_mcp.tools.components import get_typography_library as _get_typography
-
-    result = await _get_typography(file_id)
-    return json.dumps(result, indent=2)
+get_component_instances = _tool()(_wrap_tool(_components.get_component_instances))
+get_design_tokens = _tool()(
+    _wrap_tool(_components.get_design_tokens, cache="revn")
+)
+get_colors_library = _tool()(
+    _wrap_tool(_components.get_colors_library, cache="revn")
+)
+get_typography_library = _tool()(
+    _wrap_tool(_components.get_typography_library, cache="revn")
+)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -489,97 +503,12 @@ async def get_typography_library(file_id: str) -> str:
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
-async def get_comments(file_id: str, resolved: bool | None = None) -> str:
-    """Get all comments on a file.
-
-    Args:
-        file_id: The file UUID.
-        resolved: Filter — True=resolved, False=unresolved, omit=all.
-    """
-    from penpot_mcp.tools.comments import get_comments as _get_comments
-
-    result = await _get_comments(file_id, resolved)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def get_active_users(file_id: str) -> str:
-    """Get users currently editing a file (real-time presence).
-
-    Args:
-        file_id: The file UUID.
-    """
-    from penpot_mcp.tools.comments import get_active_users as _get_active_users
-
-    result = await _get_active_users(file_id)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def get_share_links(file_id: str) -> str:
-    """List share links for a file.
-
-    Args:
-        file_id: The file UUID.
-    """
-    from penpot_mcp.tools.comments import get_share_links as _get_share_links
-
-    result = await _get_share_links(file_id)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def create_comment(
-    file_id: str,
-    page_id: str,
-    content: str,
-    x: float,
-    y: float,
-    frame_id: str | None = None,
-) -> str:
-    """Create a new comment on a page at a specific position.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        content: Comment text.
-        x: X position.
-        y: Y position.
-        frame_id: Optional frame to attach the comment to.
-    """
-    from penpot_mcp.tools.comments import create_comment as _create_comment
-
-    result = await _create_comment(file_id, page_id, content, x, y, frame_id)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def reply_to_comment(thread_id: str, content: str) -> str:
-    """Reply to an existing comment thread.
-
-    Args:
-        thread_id: The comment thread UUID.
-        content: Reply text.
-    """
-    from penpot_mcp.tools.comments import reply_to_comment as _reply
-
-    result = await _reply(thread_id, content)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def resolve_comment(thread_id: str, resolved: bool = True) -> str:
-    """Resolve or unresolve a comment thread.
-
-    Args:
-        thread_id: The comment thread UUID.
-        resolved: True to resolve, False to unresolve.
-    """
-    from penpot_mcp.tools.comments import resolve_comment as _resolve
-
-    result = await _resolve(thread_id, resolved)
-    return json.dumps(result, indent=2, default=str)
+get_comments = _tool()(_wrap_tool(_comments.get_comments))
+get_active_users = _tool()(_wrap_tool(_comments.get_active_users))
+get_share_links = _tool()(_wrap_tool(_comments.get_share_links))
+create_comment = _tool()(_wrap_tool(_comments.create_comment, invalidates=True))
+reply_to_comment = _tool()(_wrap_tool(_comments.reply_to_comment, invalidates=True))
+resolve_comment = _tool()(_wrap_tool(_comments.resolve_comment, invalidates=True))
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -587,45 +516,9 @@ async def resolve_comment(thread_id: str, resolved: bool = True) -> str:
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
-async def list_media_assets(file_id: str) -> str:
-    """List all media assets (images) in a file.
-
-    Args:
-        file_id: The file UUID.
-    """
-    from penpot_mcp.tools.media import list_media_assets as _list_media
-
-    result = await _list_media(file_id)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def list_fonts(team_id: str) -> str:
-    """List custom fonts uploaded to a team.
-
-    Args:
-        team_id: The team UUID.
-    """
-    from penpot_mcp.tools.media import list_fonts as _list_fonts
-
-    result = await _list_fonts(team_id)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
-async def upload_media(file_id: str, name: str, url: str) -> str:
-    """Upload an image to a file from a URL.
-
-    Args:
-        file_id: The file UUID.
-        name: Name for the media asset.
-        url: Public URL of the image.
-    """
-    from penpot_mcp.tools.media import upload_media as _upload
-
-    result = await _upload(file_id, name, url)
-    return json.dumps(result, indent=2, default=str)
+list_media_assets = _tool()(_wrap_tool(_media.list_media_assets))
+list_fonts = _tool()(_wrap_tool(_media.list_fonts))
+upload_media = _tool()(_wrap_tool(_media.upload_media, invalidates=True))
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -633,7 +526,7 @@ async def upload_media(file_id: str, name: str, url: str) -> str:
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
+@_tool()
 async def query_database(sql: str) -> str:
     """Execute a read-only SQL query against the Penpot database.
 
@@ -642,30 +535,18 @@ async def query_database(sql: str) -> str:
     Args:
         sql: SQL SELECT query.
     """
-    from penpot_mcp.tools.database import query_database as _query
+    result = await _database.query_database(sql)
+    return await _dumps_large(result)
 
-    result = await _query(sql)
-    return json.dumps(result, indent=2)
 
+get_webhooks = _tool()(_wrap_tool(_database.get_webhooks))
 
-@mcp.tool()
-async def get_webhooks(team_id: str) -> str:
-    """List webhooks configured for a team.
 
-    Args:
-        team_id: The team UUID.
-    """
-    from penpot_mcp.tools.database import get_webhooks as _get_webhooks
-
-    result = await _get_webhooks(team_id)
-    return json.dumps(result, indent=2)
-
-
-@mcp.tool()
+@_tool()
 async def get_profile() -> str:
     """Get the authenticated user's profile information."""
     result = await api.get_profile()
-    return json.dumps(result, indent=2, default=str)
+    return _dumps(result)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -673,7 +554,7 @@ async def get_profile() -> str:
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
+@_tool()
 async def create_snapshot(file_id: str, label: str) -> str:
     """Create a named snapshot (version) of a file.
 
@@ -682,10 +563,10 @@ async def create_snapshot(file_id: str, label: str) -> str:
         label: Label for the snapshot.
     """
     result = await api.create_snapshot(file_id, label)
-    return json.dumps(result, indent=2, default=str)
+    return _dumps(result)
 
 
-@mcp.tool()
+@_tool()
 async def get_snapshots(file_id: str) -> str:
     """List all snapshots of a file.
 
@@ -693,7 +574,7 @@ async def get_snapshots(file_id: str) -> str:
         file_id: The file UUID.
     """
     result = await api.get_snapshots(file_id)
-    return json.dumps(result, indent=2, default=str)
+    return _dumps(result)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -701,42 +582,8 @@ async def get_snapshots(file_id: str) -> str:
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
-async def export_frame_png(
-    file_id: str, page_id: str, object_id: str, scale: float = 1.0
-) -> str:
-    """Export a frame or shape to PNG via Penpot's exporter (headless Chromium).
-
-    Returns base64-encoded PNG data. Use scale=2.0 for retina quality.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        object_id: The shape/frame UUID to export.
-        scale: Scale factor (1.0=normal, 2.0=retina).
-    """
-    from penpot_mcp.tools.export import export_frame_png as _export
-
-    result = await _export(file_id, page_id, object_id, scale)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def export_frame_svg(file_id: str, page_id: str, object_id: str) -> str:
-    """Export a frame or shape to SVG.
-
-    Uses Penpot's exporter for pixel-perfect SVG; falls back to local
-    SVG generation from shape data if the exporter is unavailable.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        object_id: The shape/frame UUID to export.
-    """
-    from penpot_mcp.tools.export import export_frame_svg as _export
-
-    result = await _export(file_id, page_id, object_id)
-    return json.dumps(result, indent=2, default=str)
+export_frame_png = _tool()(_wrap_tool(_export.export_frame_png))
+export_frame_svg = _tool()(_wrap_tool(_export.export_frame_svg))
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -744,26 +591,35 @@ async def export_frame_svg(file_id: str, page_id: str, object_id: str) -> str:
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
+@_tool()
 async def get_file_raw_data(file_id: str, page_id: str | None = None) -> str:
     """Get the decoded internal data structure of a file.
 
     Returns the file's pages, components, colors, and typographies
     after full transit decoding. Useful for debugging and advanced automation.
+    For a single page, objects_summary holds parallel ids/names/types/
+    parent_ids lists (index i of each describes the same object).
 
     Args:
         file_id: The file UUID.
         page_id: Optional — returns only that page's data if provided.
     """
-    from penpot_mcp.tools.advanced import get_file_raw_data as _get
+    result = await _advanced.get_file_raw_data(file_id, page_id)
+    return await _dumps_large(result)
+
 
-    result = await _get(file_id, page_id)
-    return json.dumps(result, indent=2, default=str)
+# file_change rows are append-only, so a comparison only goes stale when the
+# file's revn moves (which matters when revn_to defaults to the latest).
+_compare_revisions_cached = _wrap_tool(_advanced.compare_revisions, cache="revn")
 
 
-@mcp.tool()
+@_tool()
 async def compare_revisions(
-    file_id: str, revn_from: int, revn_to: int | None = None
+    file_id: str,
+    revn_from: int,
+    revn_to: int | None = None,
+    include_authors: bool = True,
+    scan_ops: bool = True,
 ) -> str:
     """Compare two revisions of a file to see what changed.
 
@@ -774,11 +630,13 @@ async def compare_revisions(
         file_id: The file UUID.
         revn_from: Starting revision number.
         revn_to: Ending revision number (default: latest).
+        include_authors: Include each revision's author name (default true).
+        scan_ops: Include operation type counts per revision (default true).
+            Turn both off for a quick metadata-only listing.
     """
-    from penpot_mcp.tools.advanced import compare_revisions as _compare
-
-    result = await _compare(file_id, revn_from, revn_to)
-    return json.dumps(result, indent=2, default=str)
+    return await _compare_revisions_cached(
+        file_id, revn_from, revn_to, include_authors, scan_ops
+    )
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -786,348 +644,15 @@ async def compare_revisions(
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
-async def create_rectangle(
-    file_id: str,
-    page_id: str,
-    x: float = 0,
-    y: float = 0,
-    width: float = 100,
-    height: float = 100,
-    name: str = "Rectangle",
-    fill_color: str = "#B1B2B5",
-    fill_opacity: float = 1.0,
-    stroke_color: str | None = None,
-    stroke_width: float = 1.0,
-    opacity: float = 1.0,
-    border_radius: float = 0,
-    parent_id: str | None = None,
-) -> str:
-    """Create a rectangle shape on a page.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        x: X position (default 0).
-        y: Y position (default 0).
-        width: Width in pixels (default 100).
-        height: Height in pixels (default 100).
-        name: Shape name (default "Rectangle").
-        fill_color: Fill color hex (default "#B1B2B5").
-        fill_opacity: Fill opacity 0-1 (default 1.0).
-        stroke_color: Optional stroke color hex.
-        stroke_width: Stroke width in pixels (default 1.0).
-        opacity: Overall opacity 0-1 (default 1.0).
-        border_radius: Corner radius for all corners (default 0).
-        parent_id: Parent shape ID. If omitted, adds to root frame.
-    """
-    from penpot_mcp.tools.create import create_rectangle as _create
-
-    result = await _create(
-        file_id,
-        page_id,
-        x,
-        y,
-        width,
-        height,
-        name,
-        fill_color,
-        fill_opacity,
-        stroke_color,
-        stroke_width,
-        opacity,
-        border_radius,
-        parent_id,
-    )
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def create_frame(
-    file_id: str,
-    page_id: str,
-    x: float = 0,
-    y: float = 0,
-    width: float = 300,
-    height: float = 300,
-    name: str = "Frame",
-    fill_color: str = "#FFFFFF",
-    fill_opacity: float = 1.0,
-    stroke_color: str | None = None,
-    stroke_width: float = 1.0,
-    opacity: float = 1.0,
-    border_radius: float = 0,
-    clip_content: bool = True,
-    parent_id: str | None = None,
-) -> str:
-    """Create a frame (artboard/container) that can hold child shapes.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        x: X position (default 0).
-        y: Y position (default 0).
-        width: Width in pixels (default 300).
-        height: Height in pixels (default 300).
-        name: Frame name (default "Frame").
-        fill_color: Background color hex (default "#FFFFFF").
-        fill_opacity: Background opacity 0-1 (default 1.0).
-        stroke_color: Optional border color hex.
-        stroke_width: Border width (default 1.0).
-        opacity: Overall opacity 0-1 (default 1.0).
-        border_radius: Corner radius (default 0).
-        clip_content: Clip children at frame bounds (default true).
-        parent_id: Parent frame ID. If omitted, adds to root.
-    """
-    from penpot_mcp.tools.create import create_frame as _create
-
-    result = await _create(
-        file_id,
-        page_id,
-        x,
-        y,
-        width,
-        height,
-        name,
-        fill_color,
-        fill_opacity,
-        stroke_color,
-        stroke_width,
-        opacity,
-        border_radius,
-        clip_content,
-        parent_id,
-    )
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def create_ellipse(
-    file_id: str,
-    page_id: str,
-    x: float = 0,
-    y: float = 0,
-    width: float = 100,
-    height: float = 100,
-    name: str = "Ellipse",
-    fill_color: str = "#B1B2B5",
-    fill_opacity: float = 1.0,
-    stroke_color: str | None = None,
-    stroke_width: float = 1.0,
-    opacity: float = 1.0,
-    parent_id: str | None = None,
-) -> str:
-    """Create an ellipse (or circle if width==height) on a page.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        x: X position (default 0).
-        y: Y position (default 0).
-        width: Width in pixels (default 100).
-        height: Height in pixels (default 100).
-        name: Shape name (default "Ellipse").
-        fill_color: Fill color hex (default "#B1B2B5").
-        fill_opacity: Fill opacity 0-1 (default 1.0).
-        stroke_color: Optional stroke color hex.
-        stroke_width: Stroke width (default 1.0).
-        opacity: Overall opacity 0-1 (default 1.0).
-        parent_id: Parent shape ID. If omitted, adds to root.
-    """
-    from penpot_mcp.tools.create import create_ellipse as _create
-
-    result = await _create(
-        file_id,
-        page_id,
-        x,
-        y,
-        width,
-        height,
-        name,
-        fill_color,
-        fill_opacity,
-        stroke_color,
-        stroke_width,
-        opacity,
-        parent_id,
-    )
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def create_text(
-    file_id: str,
-    page_id: str,
-    text: str = "Text",
-    x: float = 0,
-    y: float = 0,
-    width: float | None = None,
-    height: float | None = None,
-    name: str | None = None,
-    font_family: str = "sourcesanspro",
-    font_size: int = 16,
-    font_weight: str = "400",
-    font_style: str = "normal",
-    fill_color: str = "#000000",
-    fill_opacity: float = 1.0,
-    text_align: str = "left",
-    line_height: float = 1.2,
-    letter_spacing: float = 0,
-    text_decoration: str = "none",
-    opacity: float = 1.0,
-    parent_id: str | None = None,
-) -> str:
-    """Create a text shape on a page.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        text: Text content (default "Text").
-        x: X position (default 0).
-        y: Y position (default 0).
-        width: Text box width (auto-calculated if omitted).
-        height: Text box height (auto-calculated if omitted).
-        name: Shape name (defaults to text content).
-        font_family: Font family (default "sourcesanspro").
-        font_size: Font size in pixels (default 16).
-        font_weight: Weight — "400"=normal, "700"=bold (default "400").
-        font_style: Style — "normal" or "italic" (default "normal").
-        fill_color: Text color hex (default "#000000").
-        fill_opacity: Text opacity 0-1 (default 1.0).
-        text_align: Alignment — "left"/"center"/"right"/"justify" (default "left").
-        line_height: Line height multiplier (default 1.2).
-        letter_spacing: Letter spacing pixels (default 0).
-        text_decoration: "none"/"underline"/"line-through" (default "none").
-        opacity: Overall shape opacity 0-1 (default 1.0).
-        parent_id: Parent shape ID. If omitted, adds to root.
-    """
-    from penpot_mcp.tools.create import create_text as _create
-
-    result = await _create(
-        file_id,
-        page_id,
-        text,
-        x,
-        y,
-        width,
-        height,
-        name,
-        font_family,
-        font_size,
-        font_weight,
-        font_style,
-        fill_color,
-        fill_opacity,
-        text_align,
-        line_height,
-        letter_spacing,
-        text_decoration,
-        opacity,
-        parent_id,
-    )
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def create_path(
-    file_id: str,
-    page_id: str,
-    segments: list[dict],
-    name: str = "Path",
-    fill_color: str | None = None,
-    fill_opacity: float = 1.0,
-    stroke_color: str = "#000000",
-    stroke_width: float = 1.0,
-    opacity: float = 1.0,
-    parent_id: str | None = None,
-) -> str:
-    """Create a vector path shape.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        segments: Path segments — list of {command, x, y} dicts. Commands: "M"=move, "L"=line, "C"=curve (with c1x,c1y,c2x,c2y), "Z"=close.
-        name: Shape name (default "Path").
-        fill_color: Optional fill color hex.
-        fill_opacity: Fill opacity 0-1 (default 1.0).
-        stroke_color: Stroke color hex (default "#000000").
-        stroke_width: Stroke width (default 1.0).
-        opacity: Overall opacity 0-1 (default 1.0).
-        parent_id: Parent shape ID. If omitted, adds to root.
-    """
-    from penpot_mcp.tools.create import create_path as _create
-
-    result = await _create(
-        file_id,
-        page_id,
-        segments,
-        name,
-        fill_color,
-        fill_opacity,
-        stroke_color,
-        stroke_width,
-        opacity,
-        parent_id,
-    )
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def create_group(
-    file_id: str,
-    page_id: str,
-    shape_ids: list[str],
-    name: str = "Group",
-    parent_id: str | None = None,
-) -> str:
-    """Group existing shapes together.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_ids: List of shape UUIDs to group.
-        name: Group name (default "Group").
-        parent_id: Parent shape ID. If omitted, uses root.
-    """
-    from penpot_mcp.tools.create import create_group as _create
-
-    result = await _create(file_id, page_id, shape_ids, name, parent_id)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def create_component(
-    file_id: str,
-    page_id: str,
-    shape_id: str,
-    name: str | None = None,
-) -> str:
-    """Convert a shape/frame into a reusable component.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The shape UUID to convert.
-        name: Component name (keeps current name if omitted).
-    """
-    from penpot_mcp.tools.create import create_component as _create
-
-    result = await _create(file_id, page_id, shape_id, name)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def create_page(file_id: str, name: str = "New Page") -> str:
-    """Add a new page to a file.
-
-    Args:
-        file_id: The file UUID.
-        name: Page name (default "New Page").
-    """
-    from penpot_mcp.tools.create import create_page as _create
-
-    result = await _create(file_id, name)
-    return json.dumps(result, indent=2, default=str)
+create_rectangle = _tool()(_wrap_tool(_create.create_rectangle, invalidates=True))
+create_frame = _tool()(_wrap_tool(_create.create_frame, invalidates=True))
+create_ellipse = _tool()(_wrap_tool(_create.create_ellipse, invalidates=True))
+create_text = _tool()(_wrap_tool(_create.create_text, invalidates=True))
+create_path = _tool()(_wrap_tool(_create.create_path, invalidates=True))
+create_shapes = _tool()(_wrap_tool(_create.create_shapes, invalidates=True))
+create_group = _tool()(_wrap_tool(_create.create_group, invalidates=True))
+create_component = _tool()(_wrap_tool(_create.create_component, invalidates=True))
+create_page = _tool()(_wrap_tool(_create.create_page, invalidates=True))
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -1135,251 +660,18 @@ async def create_page(file_id: str, name: str = "New Page") -> str:
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
-async def modify_shape(file_id: str, page_id: str, shape_id: str, attrs: dict) -> str:
-    """Modify arbitrary attributes of a shape.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The shape UUID.
-        attrs: Dict of kebab-case attributes to set. E.g. {"opacity": 0.5, "name": "New Name"}.
-    """
-    from penpot_mcp.tools.modify import modify_shape as _modify
-
-    result = await _modify(file_id, page_id, shape_id, attrs)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def move_shape(
-    file_id: str, page_id: str, shape_id: str, x: float, y: float
-) -> str:
-    """Move a shape to a new position.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The shape UUID.
-        x: New X position.
-        y: New Y position.
-    """
-    from penpot_mcp.tools.modify import move_shape as _move
-
-    result = await _move(file_id, page_id, shape_id, x, y)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def resize_shape(
-    file_id: str, page_id: str, shape_id: str, width: float, height: float
-) -> str:
-    """Resize a shape.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The shape UUID.
-        width: New width in pixels.
-        height: New height in pixels.
-    """
-    from penpot_mcp.tools.modify import resize_shape as _resize
-
-    result = await _resize(file_id, page_id, shape_id, width, height)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def delete_shape(file_id: str, page_id: str, shape_id: str) -> str:
-    """Delete a shape from a page.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The shape UUID.
-    """
-    from penpot_mcp.tools.modify import delete_shape as _delete
-
-    result = await _delete(file_id, page_id, shape_id)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def rename_shape(file_id: str, page_id: str, shape_id: str, name: str) -> str:
-    """Rename a shape.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The shape UUID.
-        name: New name.
-    """
-    from penpot_mcp.tools.modify import rename_shape as _rename
-
-    result = await _rename(file_id, page_id, shape_id, name)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def set_fill(
-    file_id: str,
-    page_id: str,
-    shape_id: str,
-    color: str = "#B1B2B5",
-    opacity: float = 1.0,
-) -> str:
-    """Set the fill color of a shape.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The shape UUID.
-        color: Fill color hex (default "#B1B2B5").
-        opacity: Fill opacity 0-1 (default 1.0).
-    """
-    from penpot_mcp.tools.modify import set_fill as _set_fill
-
-    result = await _set_fill(file_id, page_id, shape_id, color, opacity)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def set_stroke(
-    file_id: str,
-    page_id: str,
-    shape_id: str,
-    color: str = "#000000",
-    width: float = 1.0,
-    opacity: float = 1.0,
-    style: str = "solid",
-) -> str:
-    """Set the stroke (border) of a shape.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The shape UUID.
-        color: Stroke color hex (default "#000000").
-        width: Stroke width pixels (default 1.0).
-        opacity: Stroke opacity 0-1 (default 1.0).
-        style: "solid"/"dashed"/"dotted"/"mixed" (default "solid").
-    """
-    from penpot_mcp.tools.modify import set_stroke as _set_stroke
-
-    result = await _set_stroke(file_id, page_id, shape_id, color, width, opacity, style)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def set_opacity(file_id: str, page_id: str, shape_id: str, opacity: float) -> str:
-    """Set the overall opacity of a shape.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The shape UUID.
-        opacity: Opacity 0 (transparent) to 1 (opaque).
-    """
-    from penpot_mcp.tools.modify import set_opacity as _set_opacity
-
-    result = await _set_opacity(file_id, page_id, shape_id, opacity)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def set_layout(
-    file_id: str,
-    page_id: str,
-    frame_id: str,
-    layout_type: str = "flex",
-    direction: str = "row",
-    gap: float = 0,
-    padding: float = 0,
-    align_items: str | None = None,
-    justify_content: str | None = None,
-    wrap: str = "nowrap",
-) -> str:
-    """Set flex/grid layout on a frame (auto-layout container).
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        frame_id: The frame shape UUID.
-        layout_type: "flex" or "grid" (default "flex").
-        direction: "row"/"column"/"row-reverse"/"column-reverse" (default "row").
-        gap: Gap between children pixels (default 0).
-        padding: Padding on all sides pixels (default 0).
-        align_items: Cross-axis — "start"/"center"/"end"/"stretch".
-        justify_content: Main-axis — "start"/"center"/"end"/"space-between"/"space-around"/"space-evenly".
-        wrap: "nowrap" or "wrap" (default "nowrap").
-    """
-    from penpot_mcp.tools.modify import set_layout as _set_layout
-
-    result = await _set_layout(
-        file_id,
-        page_id,
-        frame_id,
-        layout_type,
-        direction,
-        gap,
-        padding,
-        align_items,
-        justify_content,
-        wrap,
-    )
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def reorder_shapes(
-    file_id: str,
-    page_id: str,
-    parent_id: str,
-    shape_ids: list[str],
-    index: int = 0,
-) -> str:
-    """Reorder shapes within a parent (z-order).
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        parent_id: Parent shape/frame UUID.
-        shape_ids: Shape UUIDs to move.
-        index: Target index (0=bottom, default 0).
-    """
-    from penpot_mcp.tools.modify import reorder_shapes as _reorder
-
-    result = await _reorder(file_id, page_id, parent_id, shape_ids, index)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def delete_page(file_id: str, page_id: str) -> str:
-    """Delete a page from a file.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-    """
-    from penpot_mcp.tools.modify import delete_page as _delete
-
-    result = await _delete(file_id, page_id)
-    return json.dumps(result, indent=2, default=str)
-
-
-@mcp.tool()
-async def rename_page(file_id: str, page_id: str, name: str) -> str:
-    """Rename a page.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        name: New name.
-    """
-    from penpot_mcp.tools.modify import rename_page as _rename
-
-    result = await _rename(file_id, page_id, name)
-    return json.dumps(result, indent=2, default=str)
+modify_shape = _tool()(_wrap_tool(_modify.modify_shape, invalidates=True))
+move_shape = _tool()(_wrap_tool(_modify.move_shape, invalidates=True))
+resize_shape = _tool()(_wrap_tool(_modify.resize_shape, invalidates=True))
+delete_shape = _tool()(_wrap_tool(_modify.delete_shape, invalidates=True))
+rename_shape = _tool()(_wrap_tool(_modify.rename_shape, invalidates=True))
+set_fill = _tool()(_wrap_tool(_modify.set_fill, invalidates=True))
+set_stroke = _tool()(_wrap_tool(_modify.set_stroke, invalidates=True))
+set_opacity = _tool()(_wrap_tool(_modify.set_opacity, invalidates=True))
+set_layout = _tool()(_wrap_tool(_modify.set_layout, invalidates=True))
+reorder_shapes = _tool()(_wrap_tool(_modify.reorder_shapes, invalidates=True))
+delete_page = _tool()(_wrap_tool(_modify.delete_page, invalidates=True))
+rename_page = _tool()(_wrap_tool(_modify.rename_page, invalidates=True))
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -1387,48 +679,53 @@ async def rename_page(file_id: str, page_id: str, name: str) -> str:
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
-async def get_active_selection() -> str:
+@_tool()
+def get_active_selection() -> str:
     """Get the UUIDs of the shapes currently selected by the user in the Penpot Plugin.
 
     This requires the user to have the Penpot MCP Plugin open and connected in their browser.
     """
-    from penpot_mcp.gateway import gateway
-
-    if not gateway.is_interactive:
-        return json.dumps(
-            {
-                "error": "No active Penpot Plugin connection found. The user must have the plugin open."
-            },
-            indent=2,
-        )
+    gateway = get_gateway()
+    with gateway.ws_snapshot():
+        if not gateway.is_interactive:
+            return _dumps(
+                {
+                    "error": "No active Penpot Plugin connection found. The user must have the plugin open."
+                }
+            )
+
+        return _dumps({"selected_shape_ids": gateway.active_selection})
 
-    return json.dumps({"selected_shape_ids": gateway.active_selection}, indent=2)
 
+# Scripts sent with wait=False; held here so they aren't garbage-collected mid-send.
+_background_sends: set[asyncio.Task] = set()
 
-@mcp.tool()
-async def execute_plugin_script(script: str) -> str:
+
+@_tool()
+async def execute_plugin_script(script: str, wait: bool = True) -> str:
     """Execute a JavaScript snippet directly within the user's Penpot Plugin environment.
 
     This allows direct manipulation of the canvas using the Penpot Plugin API.
 
     Args:
         script: The JavaScript code to execute.
+        wait: Wait until the script has been sent (default True). With False the
+            tool returns immediately and delivery is not confirmed.
     """
-    from penpot_mcp.ws_controller import ws_controller
-
     if not ws_controller.is_connected:
-        return json.dumps(
-            {"error": "No active Penpot Plugin connection found."}, indent=2
-        )
+        return _dumps({"error": "No active Penpot Plugin connection found."})
+
+    if not wait:
+        task = asyncio.create_task(ws_controller.send_command(script))
+        _background_sends.add(task)
+        task.add_done_callback(_background_sends.discard)
+        return _dumps({"status": "dispatched"})
 
     success = await ws_controller.send_command(script)
     if success:
-        return json.dumps(
-            {"status": "Script executed (or broadcasted) successfully."}, indent=2
-        )
+        return _dumps({"status": "Script executed (or broadcasted) successfully."})
     else:
-        return json.dumps({"error": "Failed to send script."}, indent=2)
+        return _dumps({"error": "Failed to send script."})
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -1436,132 +733,88 @@ async def execute_plugin_script(script: str) -> str:
 # ═══════════════════════════════════════════════════════════════
 
 
-@mcp.tool()
-async def set_text_content(
-    file_id: str,
-    page_id: str,
-    shape_id: str,
-    text: str,
-    font_family: str | None = None,
-    font_size: int | None = None,
-    font_weight: str | None = None,
-    fill_color: str | None = None,
-    text_align: str | None = None,
-) -> str:
-    """Replace text content of a text shape.
+set_text_content = _tool()(_wrap_tool(_text.set_text_content, invalidates=True))
+set_font = _tool()(_wrap_tool(_text.set_font, invalidates=True))
+set_font_size = _tool()(_wrap_tool(_text.set_font_size, invalidates=True))
+set_text_align = _tool()(_wrap_tool(_text.set_text_align, invalidates=True))
+set_text_style = _tool()(_wrap_tool(_text.set_text_style, invalidates=True))
 
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The text shape UUID.
-        text: New text content.
-        font_family: Optional font family override.
-        font_size: Optional font size override.
-        font_weight: Optional font weight override.
-        fill_color: Optional text color override (hex).
-        text_align: Optional alignment override.
-    """
-    from penpot_mcp.tools.text import set_text_content as _set
-
-    result = await _set(
-        file_id,
-        page_id,
-        shape_id,
-        text,
-        font_family,
-        font_size,
-        font_weight,
-        fill_color,
-        text_align,
-    )
-    return json.dumps(result, indent=2, default=str)
 
+# ═══════════════════════════════════════════════════════════════
+# Category 12: Batching
+# ═══════════════════════════════════════════════════════════════
 
-@mcp.tool()
-async def set_font(file_id: str, page_id: str, shape_id: str, font_family: str) -> str:
-    """Change the font family of a text shape.
 
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The text shape UUID.
-        font_family: Font family name (e.g., "sourcesanspro", "roboto").
-    """
-    from penpot_mcp.tools.text import set_font as _set
+async def _run_batched(call: Any) -> Any:
+    """Run one batch entry through the tool manager and return its JSON."""
+    if not isinstance(call, dict) or not isinstance(call.get("name"), str):
+        return {"error": "Each call needs a 'name' and optional 'args' object"}
+    name = call["name"]
+    if name == "batch":
+        return {"name": name, "error": "batch calls cannot be nested"}
+    try:
+        result = await mcp.call_tool(name, call.get("args") or {})
+    except ToolError as e:
+        # FastMCP reports unknown tools and every tool failure this way
+        return {"name": name, "error": str(e)}
+    blocks = result[0] if isinstance(result, tuple) else result
+    text = "".join(b.text for b in blocks if b.type == "text")
+    # Every tool already returns encoded JSON; embed it without re-parsing.
+    return {"name": name, "result": orjson.Fragment(text)}
 
-    result = await _set(file_id, page_id, shape_id, font_family)
-    return json.dumps(result, indent=2, default=str)
 
+@_tool()
+async def batch(calls: list[dict]) -> str:
+    """Run several tool calls in one request and return their results in order.
 
-@mcp.tool()
-async def set_font_size(
-    file_id: str, page_id: str, shape_id: str, font_size: int
-) -> str:
-    """Change the font size of a text shape.
+    Calls run concurrently, so only batch independent calls (e.g.
+    get_colors_library + get_typography_library + get_design_tokens for one
+    file). Put calls that depend on an earlier result in a later batch.
+    Create/modify calls on the same file are sent as one update.
 
     Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The text shape UUID.
-        font_size: Font size in pixels.
+        calls: List of {"name": "<tool name>", "args": {...}} objects.
     """
-    from penpot_mcp.tools.text import set_font_size as _set
+    results = await asyncio.gather(*(_run_batched(c) for c in calls))
+    return _dumps(results)
 
-    result = await _set(file_id, page_id, shape_id, font_size)
-    return json.dumps(result, indent=2, default=str)
 
+# ═══════════════════════════════════════════════════════════════
+# Entry point
+# ═══════════════════════════════════════════════════════════════
 
-@mcp.tool()
-async def set_text_align(file_id: str, page_id: str, shape_id: str, align: str) -> str:
-    """Set text alignment.
 
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The text shape UUID.
-        align: "left"/"center"/"right"/"justify".
-    """
-    from penpot_mcp.tools.text import set_text_align as _set
-
-    result = await _set(file_id, page_id, shape_id, align)
-    return json.dumps(result, indent=2, default=str)
+async def _gather_all(*aws: Awaitable[Any]) -> list[BaseException]:
+    """Run awaitables concurrently to completion and return their exceptions."""
+    results = await asyncio.gather(*aws, return_exceptions=True)
+    return [r for r in results if isinstance(r, BaseException)]
 
 
-@mcp.tool()
-async def set_text_style(
-    file_id: str,
-    page_id: str,
-    shape_id: str,
-    font_weight: str | None = None,
-    font_style: str | None = None,
-    text_decoration: str | None = None,
-) -> str:
-    """Set text styling (bold, italic, underline).
+async def _close_services() -> None:
+    # Independent resources, and each close is a no-op if never opened
+    for exc in await _gather_all(ws_controller.stop(), api.close(), db.close()):
+        logger.warning("Error during shutdown: %r", exc)
 
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        shape_id: The text shape UUID.
-        font_weight: "400"=normal, "700"=bold, etc.
-        font_style: "normal" or "italic".
-        text_decoration: "none"/"underline"/"line-through".
-    """
-    from penpot_mcp.tools.text import set_text_style as _set
-
-    result = await _set(
-        file_id,
-        page_id,
-        shape_id,
-        font_weight,
-        font_style,
-        text_decoration,
-    )
-    return json.dumps(result, indent=2, default=str)
 
+@asynccontextmanager
+async def _lifespan(app):
+    """Bring up Penpot services and the MCP session manager, tear down in reverse.
 
-# ═══════════════════════════════════════════════════════════════
-# Entry point
-# ═══════════════════════════════════════════════════════════════
+    The database, API client and WebSocket server don't depend on each other,
+    so they start and stop concurrently. Cleanup is registered first, so a
+    failure part-way through startup still closes whatever was opened.
+    """
+    async with AsyncExitStack() as stack:
+        logger.info("Connecting to Penpot services...")
+        stack.push_async_callback(_close_services)
+        errors = await _gather_all(db.connect(), api.connect(), ws_controller.start())
+        if errors:
+            raise errors[0]
+        await asyncio.gather(db.fetchval("SELECT 1"), api.warmup())
+        await stack.enter_async_context(mcp.session_manager.run())
+        logger.info("Penpot MCP server ready (WS on port %d)", settings.ws_port)
+        yield
+    logger.info("Penpot MCP server stopped")
 
 
 def main():
@@ -1576,26 +829,8 @@ def main():
 
     async def run():
         starlette_app = mcp.streamable_http_app()
-        _orig_lifespan = starlette_app.router.lifespan_context
-
-        @asynccontextmanager
-        async def _startup_lifespan(app):
-            logger.info("Connecting to Penpot services...")
-            await db.connect()
-            await api.connect()
-            from penpot_mcp.ws_controller import ws_controller
-            await ws_controller.start()
-            logger.info("Penpot MCP server ready (WS on port %d)", settings.ws_port)
-            try:
-                async with _orig_lifespan(app):
-                    yield
-            finally:
-                await ws_controller.stop()
-                await api.close()
-                await db.close()
-                logger.info("Penpot MCP server stopped")
-
-        starlette_app.router.lifespan_context = _startup_lifespan
+        starlette_app.add_middleware(_PluginCORSMiddleware)
+        starlette_app.router.lifespan_context = _lifespan
 
         config = uvicorn.Config(
             starlette_app,
@@ -1605,7 +840,14 @@ def main():
         )
         await uvicorn.Server(config).serve()
 
-    anyio.run(run)
+    # uvloop isn't available on Windows; fall back to the stdlib loop there
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        backend_options = {}
+    else:
+        backend_options = {"use_uvloop": True}
+    anyio.run(run, backend_options=backend_options)
 
 
 if __name__ == "__main__":
@@ -2,31 +2,85 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
 from typing import Any
 
 import httpx
+import orjson
 
-from penpot_mcp.config import settings
-from penpot_mcp.services.transit import decode_transit
+from penpot_mcp.config import get_settings
+from penpot_mcp.services.cache import ResponseCache
+from penpot_mcp.services.db import db
+from penpot_mcp.services.transit import _Cache, decode_transit
 
 logger = logging.getLogger(__name__)
 
+# Transit JSON-Verbose body for export-shapes; only the fields change per call.
+_EXPORT_TEMPLATE = (
+    '{{"~:cmd":"~:export-shapes","~:profile-id":"~u{profile_id}","~:wait":true,'
+    '"~:exports":[{{"~:page-id":"~u{page_id}","~:file-id":"~u{file_id}",'
+    '"~:object-id":"~u{object_id}","~:type":{export_type},"~:suffix":"",'
+    '"~:scale":{scale},"~:name":{name}}}]}}'
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _encoded_params(*items: tuple[str, Any]) -> bytes:
+    """JSON body for a read command, reused across repeat calls with the same ids."""
+    return orjson.dumps(dict(items))
+
 
 class PenpotAPI:
-    """Async HTTP client for Penpot's RPC API."""
+    """Async HTTP client for Penpot's RPC API.
+
+    All session state lives on the instance (slots, no class-level
+    defaults), so independent clients never share caches.
+    """
+
+    __slots__ = (
+        "_client",
+        "_file_cache",
+        "_file_fetches",
+        "_profile_cache",
+        "_profile_lock",
+        "_session_token",
+        "_stack",
+        "_transit_cache",
+    )
 
     def __init__(self) -> None:
         self._client: httpx.AsyncClient | None = None
+        self._stack: AsyncExitStack | None = None
         self._session_token: str | None = None
+        # The caller's profile is fixed for the life of the session
+        self._profile_cache: dict | None = None
+        self._profile_lock = asyncio.Lock()
+        # Decoded get-file payloads, keyed by file id and tagged with revn
+        self._file_cache = ResponseCache(maxsize=16)
+        # In-flight get-file fetches by (file id, revn), shared by concurrent misses
+        self._file_fetches: dict[tuple[str, int], asyncio.Future] = {}
+        # Reused by every decode; decoding never awaits, so calls can't overlap
+        self._transit_cache = _Cache()
 
     async def connect(self) -> None:
-        self._client = httpx.AsyncClient(
+        settings = get_settings()
+        client = httpx.AsyncClient(
             base_url=settings.penpot_base_url,
             timeout=30.0,
             follow_redirects=True,
+            # Negotiated via ALPN, so only HTTPS backends multiplex over h2;
+            # plain-http URLs keep using HTTP/1.1 keep-alive.
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
         )
+        self._stack = AsyncExitStack()
+        self._client = await self._stack.enter_async_context(client)
         if settings.has_access_token:
             self._client.headers["Authorization"] = (
                 f"Token {settings.penpot_access_token}"
@@ -37,33 +91,63 @@ class PenpotAPI:
         else:
             logger.warning("No authentication configured — API calls may fail")
 
+    async def warmup(self) -> None:
+        """Open a keep-alive connection to the backend ahead of the first tool call.
+
+        Also validates the configured credentials; failures are only logged.
+        """
+        try:
+            await self._get_profile_cached()
+        except httpx.HTTPError as e:
+            logger.warning("Penpot API warmup failed: %s", e)
+
     async def _login(self) -> None:
         assert self._client is not None, "API client not connected"
+        settings = get_settings()
         resp = await self._client.post(
             "/api/rpc/command/login-with-password",
             json={"email": settings.penpot_email, "password": settings.penpot_password},
         )
         resp.raise_for_status()
+        # The exporter wants this as an explicit cookie; keep it handy
+        self._session_token = self._client.cookies.get("auth-token")
+        self._profile_cache = None
         logger.info("Authenticated via credentials for %s", settings.penpot_email)
 
     async def close(self) -> None:
-        if self._client:
-            await self._client.aclose()
-
-    async def command(self, method: str, params: dict[str, Any] | None = None) -> Any:
-        """Execute an RPC command against Penpot backend."""
+        self._profile_cache = None
+        self._file_cache.clear()
+        self._session_token = None
+        if self._stack:
+            await self._stack.aclose()
+            self._stack = None
+        self._client = None
+
+    async def command(
+        self, method: str, params: dict[str, Any] | bytes | None = None
+    ) -> Any:
+        """Execute an RPC command against Penpot backend.
+
+        ``params`` may also be an already-encoded JSON body (see _encoded_params).
+        """
         assert self._client is not None, "API client not connected"
         url = f"/api/rpc/command/{method}"
         if params:
-            resp = await self._client.post(url, json=params)
+            # Change batches can be large; orjson encodes them much faster
+            body = params if isinstance(params, bytes) else orjson.dumps(params)
+            resp = await self._client.post(
+                url,
+                content=body,
+                headers={"Content-Type": "application/json"},
+            )
         else:
             resp = await self._client.get(url)
         resp.raise_for_status()
         content_type = resp.headers.get("content-type", "")
         if "application/json" in content_type:
-            return resp.json()
+            return orjson.loads(resp.content)
         if "application/transit+json" in content_type:
-            return decode_transit(resp.text)
+            return decode_transit(resp.content, self._transit_cache)
         return resp.text
 
     # ── Profile ──────────────────────────────────────────────
@@ -71,10 +155,18 @@ class PenpotAPI:
     async def get_profile(self) -> dict:
         return await self.command("get-profile")
 
+    async def _get_profile_cached(self) -> dict:
+        if self._profile_cache is not None:
+            return self._profile_cache
+        async with self._profile_lock:
+            if self._profile_cache is None:
+                self._profile_cache = await self.get_profile()
+            return self._profile_cache
+
     # ── Projects ─────────────────────────────────────────────
 
     async def get_projects(self, team_id: str) -> list[dict]:
-        return await self.command("get-projects", {"team-id": team_id})
+        return await self.command("get-projects", _encoded_params(("team-id", team_id)))
 
     async def create_project(self, team_id: str, name: str) -> dict:
         return await self.command("create-project", {"team-id": team_id, "name": name})
@@ -85,13 +177,45 @@ class PenpotAPI:
     # ── Files ────────────────────────────────────────────────
 
     async def get_file(self, file_id: str, features: list[str] | None = None) -> dict:
-        params: dict[str, Any] = {"id": file_id}
-        if features:
-            params["features"] = features
-        return await self.command("get-file", params)
+        if not features:
+            return await self.command("get-file", _encoded_params(("id", file_id)))
+        return await self.command("get-file", {"id": file_id, "features": features})
+
+    async def get_file_cached(self, file_id: str) -> dict:
+        """Fetch a file's full data (components-v2), reusing it while revn is unchanged.
+
+        The returned dict is shared between callers and must not be mutated.
+        """
+        revn = await db.fetchval("SELECT revn FROM file WHERE id = $1", file_id)
+        cached = self._file_cache.get(file_id)
+        if cached is not None and revn is not None and cached[0] == revn:
+            return cached[1]
+        if revn is None:
+            return await self._fetch_file(file_id, revn)
+        # Single-flight: tools batched together for one file share the fetch
+        key = (file_id, revn)
+        fetch = self._file_fetches.get(key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_file(file_id, revn))
+            self._file_fetches[key] = fetch
+            fetch.add_done_callback(lambda _: self._file_fetches.pop(key, None))
+        # Shielded so one cancelled caller doesn't cancel the others' fetch
+        return await asyncio.shield(fetch)
+
+    async def _fetch_file(self, file_id: str, revn: int | None) -> dict:
+        data = await self.command(
+            "get-file", _encoded_params(("id", file_id), ("components-v2", True))
+        )
+        # Tag with the revn read *before* the fetch: if the file moved in
+        # between, the next call sees a mismatch and refetches.
+        if revn is not None and isinstance(data, dict):
+            self._file_cache.set(file_id, (revn, data))
+        return data
 
     async def get_files(self, project_id: str) -> list[dict]:
-        return await self.command("get-files", {"project-id": project_id})
+        return await self.command(
+            "get-files", _encoded_params(("project-id", project_id))
+        )
 
     async def create_file(self, project_id: str, name: str) -> dict:
         return await self.command(
@@ -131,7 +255,9 @@ class PenpotAPI:
         }
         if features:
             params["features"] = features
-        return await self.command("update-file", params)
+        result = await self.command("update-file", params)
+        self._file_cache.discard(file_id)
+        return result
 
     # ── Comments ─────────────────────────────────────────────
 
@@ -179,7 +305,9 @@ class PenpotAPI:
         )
 
     async def get_snapshots(self, file_id: str) -> list[dict]:
-        return await self.command("get-file-snapshots", {"file-id": file_id})
+        return await self.command(
+            "get-file-snapshots", _encoded_params(("file-id", file_id))
+        )
 
     # ── Export ─────────────────────────────────────────────────
 
@@ -194,59 +322,62 @@ class PenpotAPI:
     ) -> bytes:
         """Export a frame/shape via the Penpot exporter service.
 
+        Returns raw bytes of the rendered content. See export_object_stream()
+        for a variant that doesn't hold the whole body in memory.
+        """
+        chunks = await self.export_object_stream(
+            file_id, page_id, object_id, export_type, scale, name
+        )
+        return b"".join([chunk async for chunk in chunks])
+
+    async def export_object_stream(
+        self,
+        file_id: str,
+        page_id: str,
+        object_id: str,
+        export_type: str = "png",
+        scale: float = 1.0,
+        name: str = "export",
+    ) -> AsyncIterator[bytes]:
+        """Export a frame/shape and return its body as an async byte stream.
+
         The exporter expects Transit JSON-Verbose format with cookie auth.
         Uses the export-shapes command with wait=true for synchronous response.
 
-        Returns raw bytes of the rendered content.
+        Rendering and fetching the result's headers happen before this
+        returns, so export failures raise here rather than mid-stream.
         """
+        settings = get_settings()
         # Get profile ID for the export request
-        profile = await self.get_profile()
+        profile = await self._get_profile_cached()
         profile_id = profile.get("id")
 
-        # Build Transit JSON-Verbose payload
-        transit_body = json.dumps(
-            {
-                "~:cmd": "~:export-shapes",
-                "~:profile-id": f"~u{profile_id}",
-                "~:wait": True,
-                "~:exports": [
-                    {
-                        "~:page-id": f"~u{page_id}",
-                        "~:file-id": f"~u{file_id}",
-                        "~:object-id": f"~u{object_id}",
-                        "~:type": f"~:{export_type}",
-                        "~:suffix": "",
-                        "~:scale": scale,
-                        "~:name": name,
-                    }
-                ],
-            }
+        # Build Transit JSON-Verbose payload. Round-tripping the ids through
+        # UUID validates them, so only the free-form fields need escaping.
+        transit_body = _EXPORT_TEMPLATE.format(
+            profile_id=uuid.UUID(str(profile_id)),
+            page_id=uuid.UUID(page_id),
+            file_id=uuid.UUID(file_id),
+            object_id=uuid.UUID(object_id),
+            export_type=json.dumps(f"~:{export_type}"),
+            scale=json.dumps(float(scale)),
+            name=json.dumps(name),
         )
 
-        # The exporter uses cookie auth — extract from client's cookie jar
-        auth_token = None
-        assert self._client is not None, "API client not connected"
-        for cookie in self._client.cookies.jar:
-            if cookie.name == "auth-token":
-                auth_token = cookie.value
-                break
-
-        headers = {"Content-Type": "application/transit+json"}
-        cookies = {"auth-token": auth_token} if auth_token else {}
-
-        resp = await self._client.post(
-            "/api/export",
-            content=transit_body,
-            headers=headers,
-            cookies=cookies,
-            timeout=60.0,
-        )
+        resp = await self._post_export(transit_body)
+        if resp.status_code in (401, 403):
+            # Session changed under us — don't keep exporting as a stale profile
+            self._profile_cache = None
+            self._session_token = None
+            if settings.has_credentials:
+                await self._login()
+                resp = await self._post_export(transit_body)
         resp.raise_for_status()
 
         # Response may be transit+json with a URI, or direct binary
         content_type = resp.headers.get("content-type", "")
         if "application/transit+json" in content_type:
-            result = decode_transit(resp.text)
+            result = decode_transit(resp.content, self._transit_cache)
             # Transit decoder resolves ~#uri to a plain string
             uri = None
             if isinstance(result, str) and result.startswith("http"):
@@ -259,11 +390,30 @@ class PenpotAPI:
                 internal_url = settings.penpot_base_url.rstrip("/")
                 if public_url and uri.startswith(public_url):
                     uri = uri.replace(public_url, internal_url, 1)
-                file_resp = await self._client.get(uri, timeout=60.0)
-                file_resp.raise_for_status()
-                return file_resp.content
-            return resp.content
-        return resp.content
+                file_resp = await self._client.send(
+                    self._client.build_request("GET", uri, timeout=60.0),
+                    stream=True,
+                )
+                try:
+                    file_resp.raise_for_status()
+                except httpx.HTTPStatusError:
+                    await file_resp.aclose()
+                    raise
+                return _iter_response(file_resp)
+        return _iter_body(resp.content)
+
+    async def _post_export(self, transit_body: str) -> httpx.Response:
+        assert self._client is not None, "API client not connected"
+        # The exporter uses cookie auth
+        auth_token = self._session_token or self._client.cookies.get("auth-token")
+        cookies = {"auth-token": auth_token} if auth_token else {}
+        return await self._client.post(
+            "/api/export",
+            content=transit_body,
+            headers={"Content-Type": "application/transit+json"},
+            cookies=cookies,
+            timeout=60.0,
+        )
 
     # ── Access Tokens ────────────────────────────────────────
 
@@ -271,5 +421,45 @@ class PenpotAPI:
         return await self.command("create-access-token", {"name": name})
 
 
-# Singleton
-api = PenpotAPI()
+async def _iter_response(resp: httpx.Response) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in resp.aiter_bytes(65536):
+            yield chunk
+    finally:
+        await resp.aclose()
+
+
+async def _iter_body(body: bytes) -> AsyncIterator[bytes]:
+    yield body
+
+
+def error_code(exc: httpx.HTTPStatusError) -> str | None:
+    """Return the backend's error ``code`` (e.g. "revn-conflict") from a failed RPC."""
+    resp = exc.response
+    content_type = resp.headers.get("content-type", "")
+    try:
+        if "application/transit+json" in content_type:
+            body = decode_transit(resp.content)
+        elif "application/json" in content_type:
+            body = orjson.loads(resp.content)
+        else:
+            return None
+    except ValueError:
+        return None
+    code = body.get("code") if isinstance(body, dict) else None
+    return code if isinstance(code, str) else None
+
+
+@functools.cache
+def get_api() -> PenpotAPI:
+    """Return the process-wide API client, creating it on first use.
+
+    The server's lifespan connects and closes this one instance; clients
+    made directly with PenpotAPI() must be connected and closed by their
+    owner.
+    """
+    return PenpotAPI()
+
+
+# Default client shared by the tools
+api = get_api()
@@ -0,0 +1,44 @@
+"""In-memory caches for read-heavy tool responses."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class ResponseCache:
+    """Bounded LRU of serialized tool responses with an optional TTL.
+
+    Entries are only touched between awaits on the event loop, so no lock
+    is needed.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float | None = None) -> None:
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if self._ttl is not None and time.monotonic() - stored_at > self._ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        if len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
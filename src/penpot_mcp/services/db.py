@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable
 from contextlib import asynccontextmanager
 from typing import Any
 
 import asyncpg
 
-from penpot_mcp.config import settings
+from penpot_mcp.config import get_settings
 
 
 class PenpotDB:
@@ -17,14 +19,30 @@ class PenpotDB:
         self._pool: asyncpg.Pool | None = None
 
     async def connect(self) -> None:
+        settings = get_settings()
         self._pool = await asyncpg.create_pool(
             host=settings.penpot_db_host,
             port=settings.penpot_db_port,
             database=settings.penpot_db_name,
             user=settings.penpot_db_user,
             password=settings.penpot_db_pass,
-            min_size=2,
-            max_size=10,
+            min_size=settings.penpot_db_pool_min,
+            max_size=settings.penpot_db_pool_max,
+            # Recycle idle connections so stale ones don't linger in the pool
+            max_inactive_connection_lifetime=300,
+            # Per-connection cache of prepared statements; every query in this
+            # module is fixed SQL text, so hot reads skip parse/plan after the
+            # first call on a connection.
+            statement_cache_size=100,
+            init=self._init_connection,
+        )
+
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection) -> None:
+        # Every caller wants UUIDs as strings; taking the text form as-is
+        # skips building a UUID object per value only to str() it later.
+        await conn.set_type_codec(
+            "uuid", encoder=str, decoder=str, schema="pg_catalog", format="text"
         )
 
     async def close(self) -> None:
@@ -36,15 +54,32 @@ class PenpotDB:
         async with self._pool.acquire() as conn:
             yield conn
 
-    async def fetch(self, query: str, *args: Any) -> list[dict]:
+    async def pipeline(self, *queries: Awaitable[Any]) -> list[Any]:
+        """Run independent queries concurrently, each on its own pool connection.
+
+        Results come back in argument order. asyncpg has no protocol-level
+        pipelining, so overlapping round-trips across connections is the
+        closest equivalent.
+        """
+        return list(await asyncio.gather(*queries))
+
+    # Rows are returned as asyncpg Records rather than copied into dicts:
+    # they support r["col"] and r.get("col"), and the server's JSON encoder
+    # converts any that are returned as-is.
+
+    async def fetch(self, query: str, *args: Any) -> list[asyncpg.Record]:
         async with self.acquire() as conn:
-            rows = await conn.fetch(query, *args)
-            return [dict(r) for r in rows]
+            return await conn.fetch(query, *args)
 
-    async def fetchrow(self, query: str, *args: Any) -> dict | None:
+    async def fetch_uncached(self, query: str, *args: Any) -> list[asyncpg.Record]:
+        """Like fetch(), but keeps one-off SQL out of the statement cache."""
         async with self.acquire() as conn:
-            row = await conn.fetchrow(query, *args)
-            return dict(row) if row else None
+            stmt = await conn.prepare(query)
+            return await stmt.fetch(*args)
+
+    async def fetchrow(self, query: str, *args: Any) -> asyncpg.Record | None:
+        async with self.acquire() as conn:
+            return await conn.fetchrow(query, *args)
 
     async def fetchval(self, query: str, *args: Any) -> Any:
         async with self.acquire() as conn:
@@ -52,15 +87,25 @@ class PenpotDB:
 
     # ── Project queries ──────────────────────────────────────
 
-    async def list_projects(self, team_id: str | None = None) -> list[dict]:
+    # File counts are aggregated once per query and joined, rather than
+    # re-running a correlated COUNT(*) for every project row.
+
+    async def list_projects(self, team_id: str | None = None) -> list[asyncpg.Record]:
         if team_id:
             return await self.fetch(
                 """
                 SELECT p.id, p.name, p.is_default, p.team_id, t.name as team_name,
                        p.created_at, p.modified_at,
-                       (SELECT COUNT(*) FROM file f WHERE f.project_id = p.id AND f.deleted_at IS NULL) as file_count
+                       COALESCE(fc.c, 0) as file_count
                 FROM project p
                 JOIN team t ON t.id = p.team_id
+                LEFT JOIN (
+                    SELECT f.project_id, COUNT(*) as c
+                    FROM file f
+                    JOIN project fp ON fp.id = f.project_id
+                    WHERE f.deleted_at IS NULL AND fp.team_id = $1
+                    GROUP BY f.project_id
+                ) fc ON fc.project_id = p.id
                 WHERE p.deleted_at IS NULL AND p.team_id = $1
                 ORDER BY p.modified_at DESC
                 """,
@@ -70,9 +115,15 @@ class PenpotDB:
             """
             SELECT p.id, p.name, p.is_default, p.team_id, t.name as team_name,
                    p.created_at, p.modified_at,
-                   (SELECT COUNT(*) FROM file f WHERE f.project_id = p.id AND f.deleted_at IS NULL) as file_count
+                   COALESCE(fc.c, 0) as file_count
             FROM project p
             JOIN team t ON t.id = p.team_id
+            LEFT JOIN (
+                SELECT project_id, COUNT(*) as c
+                FROM file
+                WHERE deleted_at IS NULL
+                GROUP BY project_id
+            ) fc ON fc.project_id = p.id
             WHERE p.deleted_at IS NULL
             ORDER BY p.modified_at DESC
             """
@@ -80,23 +131,37 @@ class PenpotDB:
 
     # ── File queries ─────────────────────────────────────────
 
-    async def list_files(self, project_id: str) -> list[dict]:
+    async def list_files(self, project_id: str) -> list[asyncpg.Record]:
         return await self.fetch(
             """
             SELECT f.id, f.name, f.project_id, f.is_shared, f.revn, f.vern,
                    f.created_at, f.modified_at, f.version,
                    p.name as project_name,
-                   (SELECT COUNT(*) FROM file_media_object fmo WHERE fmo.file_id = f.id AND fmo.deleted_at IS NULL) as media_count,
-                   (SELECT COUNT(*) FROM comment_thread ct WHERE ct.file_id = f.id) as comment_count
+                   COALESCE(mc.c, 0) as media_count,
+                   COALESCE(cc.c, 0) as comment_count
             FROM file f
             JOIN project p ON p.id = f.project_id
+            LEFT JOIN (
+                SELECT fmo.file_id, COUNT(*) as c
+                FROM file_media_object fmo
+                JOIN file mf ON mf.id = fmo.file_id
+                WHERE mf.project_id = $1 AND fmo.deleted_at IS NULL
+                GROUP BY fmo.file_id
+            ) mc ON mc.file_id = f.id
+            LEFT JOIN (
+                SELECT ct.file_id, COUNT(*) as c
+                FROM comment_thread ct
+                JOIN file cf ON cf.id = ct.file_id
+                WHERE cf.project_id = $1
+                GROUP BY ct.file_id
+            ) cc ON cc.file_id = f.id
             WHERE f.project_id = $1 AND f.deleted_at IS NULL
             ORDER BY f.modified_at DESC
             """,
             project_id,
         )
 
-    async def get_file_summary(self, file_id: str) -> dict | None:
+    async def get_file_summary(self, file_id: str) -> asyncpg.Record | None:
         return await self.fetchrow(
             """
             SELECT f.id, f.name, f.project_id, f.is_shared, f.revn, f.vern,
@@ -113,7 +178,7 @@ class PenpotDB:
             file_id,
         )
 
-    async def search_files(self, query: str) -> list[dict]:
+    async def search_files(self, query: str) -> list[asyncpg.Record]:
         return await self.fetch(
             """
             SELECT f.id, f.name, f.project_id, p.name as project_name,
@@ -127,7 +192,7 @@ class PenpotDB:
             f"%{query}%",
         )
 
-    async def get_file_history(self, file_id: str, limit: int = 20) -> list[dict]:
+    async def get_file_history(self, file_id: str, limit: int = 20) -> list[asyncpg.Record]:
         return await self.fetch(
             """
             SELECT fc.id, fc.revn, fc.created_at, fc.label, fc.created_by,
@@ -142,7 +207,7 @@ class PenpotDB:
             limit,
         )
 
-    async def get_file_libraries(self, file_id: str) -> list[dict]:
+    async def get_file_libraries(self, file_id: str) -> list[asyncpg.Record]:
         return await self.fetch(
             """
             SELECT flr.library_file_id, f.name as library_name, f.is_shared,
@@ -158,7 +223,7 @@ class PenpotDB:
 
     async def get_comments(
         self, file_id: str, resolved: bool | None = None
-    ) -> list[dict]:
+    ) -> list[asyncpg.Record]:
         base = """
             SELECT ct.id as thread_id, ct.page_name, ct.is_resolved,
                    ct.position, ct.seqn, ct.created_at as thread_created,
@@ -177,7 +242,7 @@ class PenpotDB:
 
     # ── Media & Fonts ────────────────────────────────────────
 
-    async def list_media_assets(self, file_id: str) -> list[dict]:
+    async def list_media_assets(self, file_id: str) -> list[asyncpg.Record]:
         return await self.fetch(
             """
             SELECT fmo.id, fmo.name, fmo.width, fmo.height, fmo.mtype, fmo.is_local,
@@ -189,7 +254,7 @@ class PenpotDB:
             file_id,
         )
 
-    async def list_fonts(self, team_id: str) -> list[dict]:
+    async def list_fonts(self, team_id: str) -> list[asyncpg.Record]:
         return await self.fetch(
             """
             SELECT DISTINCT ON (tfv.font_id)
@@ -204,7 +269,7 @@ class PenpotDB:
 
     # ── Teams & Profiles ─────────────────────────────────────
 
-    async def list_teams(self) -> list[dict]:
+    async def list_teams(self) -> list[asyncpg.Record]:
         return await self.fetch(
             """
             SELECT t.id, t.name, t.is_default, t.features, t.created_at,
@@ -216,7 +281,7 @@ class PenpotDB:
             """
         )
 
-    async def get_active_users(self, file_id: str) -> list[dict]:
+    async def get_active_users(self, file_id: str) -> list[asyncpg.Record]:
         return await self.fetch(
             """
             SELECT p.file_id, p.profile_id, p.updated_at,
@@ -229,7 +294,7 @@ class PenpotDB:
             file_id,
         )
 
-    async def get_share_links(self, file_id: str) -> list[dict]:
+    async def get_share_links(self, file_id: str) -> list[asyncpg.Record]:
         return await self.fetch(
             """
             SELECT sl.id, sl.pages, sl.flags, sl.who_comment, sl.who_inspect,
@@ -241,7 +306,7 @@ class PenpotDB:
             file_id,
         )
 
-    async def get_webhooks(self, team_id: str) -> list[dict]:
+    async def get_webhooks(self, team_id: str) -> list[asyncpg.Record]:
         return await self.fetch(
             """
             SELECT w.id, w.uri, w.mtype, w.is_active, w.error_code,
@@ -14,41 +14,88 @@ Cache rule (from transit-java WriteCache.isCacheable):
 
 from __future__ import annotations
 
-import json
+import sys
+from collections.abc import Callable
 from datetime import datetime, timezone
 from typing import Any
 
+import orjson
+
 _CACHE_BASE = 44
 _CACHE_BASE_CHAR = 48  # ASCII '0'
 
 # Tag chars that are always cacheable (keywords, symbols, compound tags)
 _ALWAYS_CACHEABLE_TAGS = frozenset((":", "$", "#"))
 
+_MISSING = object()
+
+# Shared UUID strings across decodes; cleared when it grows past the cap
+_UUID_CACHE: dict[str, str] = {}
+_UUID_CACHE_MAX = 50_000
+
+# Parsed values a reused _Cache may carry between messages
+_PARSED_MAX = 10_000
+
+# JSON scalars decode to themselves; checked inline to skip a call per value
+_SCALARS = frozenset((int, float, bool, type(None)))
 
-def decode_transit(data: str | Any) -> Any:
-    """Decode a Transit+JSON string or parsed structure into Python objects."""
-    if isinstance(data, str):
+
+def decode_transit(data: str | bytes | Any, cache: _Cache | None = None) -> Any:
+    """Decode a Transit+JSON string, raw body, or parsed structure into Python objects.
+
+    Pass response bytes straight in — parsing them directly skips building
+    an intermediate str of the whole body. A long-lived caller may pass its
+    own cache; it is rewound first, since ^X refs are scoped to one message.
+    """
+    if isinstance(data, (str, bytes, bytearray)):
         try:
-            data = json.loads(data)
-        except json.JSONDecodeError:
-            return data
-    cache = _Cache()
+            data = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            if isinstance(data, str):
+                return data
+            return bytes(data).decode("utf-8", errors="replace")
+    if cache is None:
+        cache = _Cache()
+    else:
+        cache.reset()
     return _decode(data, cache, as_key=False)
 
 
+def _build_ref(idx: int) -> str:
+    if idx < _CACHE_BASE:
+        return f"^{chr(_CACHE_BASE_CHAR + idx)}"
+    hi = idx // _CACHE_BASE
+    lo = idx % _CACHE_BASE
+    return f"^{chr(_CACHE_BASE_CHAR + hi)}{chr(_CACHE_BASE_CHAR + lo)}"
+
+
+# Every ref a two-char code can express, built once instead of per entry
+_REFS = tuple(_build_ref(i) for i in range(_CACHE_BASE * _CACHE_BASE))
+
+
 class _Cache:
     """Transit string cache using chr(48+N) encoding."""
 
+    __slots__ = ("_idx", "_map", "_parsed")
+
     def __init__(self):
         self._map: dict[str, str] = {}
+        # Decoded value per cached string — hits are mostly repeated keywords.
+        # Keyed by the string rather than the ref so it survives reset().
+        self._parsed: dict[str, Any] = {}
+        self._idx = 0
+
+    def reset(self) -> None:
+        """Rewind the ref table for a new message, keeping parsed values."""
+        self._map.clear()
         self._idx = 0
+        if len(self._parsed) > _PARSED_MAX:
+            self._parsed.clear()
 
     def _ref_for(self, idx: int) -> str:
-        if idx < _CACHE_BASE:
-            return f"^{chr(_CACHE_BASE_CHAR + idx)}"
-        hi = idx // _CACHE_BASE
-        lo = idx % _CACHE_BASE
-        return f"^{chr(_CACHE_BASE_CHAR + hi)}{chr(_CACHE_BASE_CHAR + lo)}"
+        if idx < len(_REFS):
+            return _REFS[idx]
+        return _build_ref(idx)
 
     def cache(self, s: str, as_key: bool = False) -> None:
         """Cache a string if it meets transit-java's cacheability rules.
@@ -59,25 +106,43 @@ class _Cache:
         if len(s) < 4:
             return
         if as_key or (s[0] == "~" and len(s) >= 2 and s[1] in _ALWAYS_CACHEABLE_TAGS):
-            ref = self._ref_for(self._idx)
-            self._map[ref] = s
-            self._idx += 1
+            self.add(s)
+
+    def add(self, s: str) -> None:
+        """Append a string already known to be cacheable."""
+        self._map[self._ref_for(self._idx)] = s
+        self._idx += 1
 
     def resolve(self, ref: str) -> str | None:
         """Resolve a ^X cache reference. Returns None if not found."""
         return self._map.get(ref)
 
+    def resolve_parsed(self, ref: str) -> Any:
+        """Resolve a ^X reference to its decoded value, or _MISSING."""
+        resolved = self._map.get(ref)
+        if resolved is None:
+            return _MISSING
+        parsed = self._parsed.get(resolved, _MISSING)
+        if parsed is _MISSING:
+            parsed = self._parsed[resolved] = _parse_tagged(resolved)
+        return parsed
+
     @staticmethod
     def is_cache_ref(s: str) -> bool:
         return len(s) >= 2 and s[0] == "^"
 
 
+# Hot path: input comes straight from a JSON parser, so exact type checks
+# stand in for isinstance and numbers fall through after three compares.
+
+
 def _decode(val: Any, cache: _Cache, as_key: bool = False) -> Any:
-    if isinstance(val, str):
+    t = type(val)
+    if t is str:
         return _decode_str(val, cache, as_key)
-    if isinstance(val, list):
+    if t is list:
         return _decode_list(val, cache)
-    if isinstance(val, dict):
+    if t is dict:
         # Transit JSON-Verbose: single-key dicts with "~#tag" key are tagged values
         if len(val) == 1:
             k = next(iter(val))
@@ -86,31 +151,36 @@ def _decode(val: Any, cache: _Cache, as_key: bool = False) -> Any:
                 tag = k[2:]
                 payload = val[k]
                 return _decode_tagged_verbose(tag, payload, cache)
-        out = {}
-        for k, v in val.items():
-            dk = _decode_str(k, cache, as_key=True) if isinstance(k, str) else k
-            dv = _decode(v, cache)
-            out[dk] = dv
-        return out
+        return {
+            (_decode_str(k, cache, True) if type(k) is str else k): (
+                v if type(v) in _SCALARS else _decode(v, cache)
+            )
+            for k, v in val.items()
+        }
     return val
 
 
 def _decode_str(s: str, cache: _Cache, as_key: bool = False) -> Any:
-    # Cache reference: ^X — resolve and return
-    if _Cache.is_cache_ref(s):
-        resolved = cache.resolve(s)
-        if resolved is not None:
-            return _parse_tagged(resolved)
+    n = len(s)
+    if n < 2:
         return s
+    first = s[0]
 
-    # Cache the string per transit-java rules
-    cache.cache(s, as_key)
+    # Cache reference: ^X — resolve and return
+    if first == "^":
+        parsed = cache.resolve_parsed(s)
+        return s if parsed is _MISSING else parsed
+
+    # Plain string: only map keys of 4+ chars are cacheable
+    if first != "~":
+        if as_key and n >= 4:
+            cache.add(s)
+        return s
 
     # Tagged string: ~X...
-    if len(s) >= 2 and s[0] == "~":
-        return _parse_tagged(s)
-
-    return s
+    if n >= 4:
+        cache.cache(s, as_key)
+    return _parse_tagged(s)
 
 
 def _parse_tagged(s: str) -> Any:
@@ -121,39 +191,40 @@ def _parse_tagged(s: str) -> Any:
     tag = s[1]
     rest = s[2:]
 
+    # Keywords and UUIDs are nearly every tagged atom, so they're tested first
     if tag == ":":  # keyword
-        return rest
+        return sys.intern(rest)
     if tag == "u":  # UUID
-        return rest
-    if tag == "m":  # instant (ms)
-        try:
-            return datetime.fromtimestamp(int(rest) / 1000.0, tz=timezone.utc).isoformat()
-        except (ValueError, OSError):
-            return s
-    if tag == "t":  # date string
-        return rest
-    if tag == "?":  # boolean
-        return rest == "t"
-    if tag == "i":  # integer
-        try:
-            return int(rest)
-        except ValueError:
-            return s
-    if tag == "d":  # double
-        try:
-            return float(rest)
-        except ValueError:
-            return s
-    if tag == "n":  # bigint
-        try:
-            return int(rest)
-        except ValueError:
-            return s
-    if tag == "~":  # escaped ~
-        return "~" + rest
-    if tag == "^":  # escaped ^
-        return "^" + rest
-    return s
+        uid = _UUID_CACHE.get(rest)
+        if uid is None:
+            if len(_UUID_CACHE) >= _UUID_CACHE_MAX:
+                _UUID_CACHE.clear()
+            uid = _UUID_CACHE[rest] = rest
+        return uid
+    # Rarer scalar tags: one table lookup instead of a comparison chain
+    handler = _TAG_HANDLERS.get(tag)
+    if handler is None:
+        return s
+    try:
+        return handler(rest)
+    except (ValueError, OSError):
+        return s
+
+
+def _parse_instant(rest: str) -> str:
+    return datetime.fromtimestamp(int(rest) / 1000.0, tz=timezone.utc).isoformat()
+
+
+_TAG_HANDLERS: dict[str, Callable[[str], Any]] = {
+    "m": _parse_instant,  # instant (ms)
+    "t": lambda rest: rest,  # date string
+    "?": lambda rest: rest == "t",  # boolean
+    "i": int,  # integer
+    "d": float,  # double
+    "n": int,  # bigint
+    "~": lambda rest: "~" + rest,  # escaped ~
+    "^": lambda rest: "^" + rest,  # escaped ^
+}
 
 
 def _decode_list(lst: list, cache: _Cache) -> Any:
@@ -164,15 +235,15 @@ def _decode_list(lst: list, cache: _Cache) -> Any:
 
     # Transit map: ["^ ", key, val, key, val, ...]
     if first == "^ ":
-        out = {}
-        items = lst[1:]
-        i = 0
-        while i < len(items) - 1:
-            key = _decode(items[i], cache, as_key=True)
-            val = _decode(items[i + 1], cache)
-            out[key] = val
-            i += 2
-        return out
+        it = iter(lst)
+        next(it)
+        # Keys and values must decode in document order for the cache
+        return {
+            (_decode_str(k, cache, True) if type(k) is str else _decode(k, cache, True)): (
+                v if type(v) in _SCALARS else _decode(v, cache)
+            )
+            for k, v in zip(it, it)
+        }
 
     # Resolve the tag string — may be a literal "~#tag" or a cache ref "^X"
     tag_str = None
@@ -198,14 +269,13 @@ def _decode_list(lst: list, cache: _Cache) -> Any:
             return [_decode(e, cache) for e in elems]
         if tag == "cmap":
             if isinstance(payload, list):
-                out = {}
-                i = 0
-                while i < len(payload) - 1:
-                    key = _decode(payload[i], cache, as_key=True)
-                    val = _decode(payload[i + 1], cache)
-                    out[key] = val
-                    i += 2
-                return out
+                it = iter(payload)
+                return {
+                    _decode(k, cache, True): (
+                        v if type(v) in _SCALARS else _decode(v, cache)
+                    )
+                    for k, v in zip(it, it)
+                }
         if tag == "ordered-set":
             elems = payload if isinstance(payload, list) else [payload]
             return [_decode(e, cache) for e in elems]
@@ -213,7 +283,7 @@ def _decode_list(lst: list, cache: _Cache) -> Any:
         return _decode(payload, cache)
 
     # Regular array
-    return [_decode(v, cache) for v in lst]
+    return [v if type(v) in _SCALARS else _decode(v, cache) for v in lst]
 
 
 def _decode_tagged_verbose(tag: str, payload: Any, cache: _Cache) -> Any:
@@ -228,14 +298,13 @@ def _decode_tagged_verbose(tag: str, payload: Any, cache: _Cache) -> Any:
         return [_decode(e, cache) for e in elems]
     if tag == "cmap":
         if isinstance(payload, list):
-            out = {}
-            i = 0
-            while i < len(payload) - 1:
-                key = _decode(payload[i], cache, as_key=True)
-                val = _decode(payload[i + 1], cache)
-                out[key] = val
-                i += 2
-            return out
+            it = iter(payload)
+            return {
+                _decode(k, cache, True): (
+                    v if type(v) in _SCALARS else _decode(v, cache)
+                )
+                for k, v in zip(it, it)
+            }
     if tag == "ordered-set":
         elems = payload if isinstance(payload, list) else [payload]
         return [_decode(e, cache) for e in elems]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from itertools import islice
 from typing import Any
 
 from penpot_mcp.services.api import api
@@ -14,11 +15,14 @@ async def get_file_raw_data(file_id: str, page_id: str | None = None) -> dict:
     Returns the file's internal data (pages, components, colors, typographies)
     after full transit decoding. Useful for debugging and advanced automation.
 
+    With ``page_id``, ``objects_summary`` is columnar: parallel ``ids``,
+    ``names``, ``types`` and ``parent_ids`` lists, one entry per object.
+
     Args:
         file_id: The file UUID.
         page_id: Optional — if provided, returns only that page's data.
     """
-    file_data = await api.command("get-file", {"id": file_id, "components-v2": True})
+    file_data = await api.get_file_cached(file_id)
 
     data = file_data.get("data", {})
     result: dict[str, Any] = {
@@ -35,15 +39,23 @@ async def get_file_raw_data(file_id: str, page_id: str | None = None) -> dict:
         result["page_id"] = page_id
         result["page_name"] = page.get("name")
         result["object_count"] = len(objects)
-        # Return first-level structure of each object (IDs + types)
+        # First-level structure of each object as parallel columns: wide
+        # pages skip a dict per object, and keys aren't repeated in the JSON.
+        ids: list[str] = []
+        names: list[Any] = []
+        types: list[Any] = []
+        parent_ids: list[Any] = []
+        for oid, obj in objects.items():
+            if isinstance(obj, dict):
+                ids.append(oid)
+                names.append(obj.get("name"))
+                types.append(obj.get("type"))
+                parent_ids.append(obj.get("parent-id"))
         result["objects_summary"] = {
-            oid: {
-                "name": _safe_get(obj, "name"),
-                "type": _safe_get(obj, "type"),
-                "parent-id": _safe_get(obj, "parent-id"),
-            }
-            for oid, obj in objects.items()
-            if isinstance(obj, dict)
+            "ids": ids,
+            "names": names,
+            "types": types,
+            "parent_ids": parent_ids,
         }
     else:
         # Return file-level summary
@@ -65,7 +77,7 @@ async def get_file_raw_data(file_id: str, page_id: str | None = None) -> dict:
                 "name": c.get("name") if isinstance(c, dict) else None,
                 "path": c.get("path") if isinstance(c, dict) else None,
             }
-            for cid, c in list(components.items())[:50]
+            for cid, c in islice(components.items(), 50)
         ]
         # Colors
         colors = data.get("colors", {})
@@ -81,6 +93,8 @@ async def compare_revisions(
     file_id: str,
     revn_from: int,
     revn_to: int | None = None,
+    include_authors: bool = True,
+    scan_ops: bool = True,
 ) -> dict:
     """Compare two revisions of a file to see what changed.
 
@@ -91,51 +105,54 @@ async def compare_revisions(
         file_id: The file UUID.
         revn_from: Starting revision number.
         revn_to: Ending revision number (default: latest).
+        include_authors: Include each revision's author name (default true).
+        scan_ops: Include the operation types of each revision (default true).
     """
-    file_info_row = await db.fetchrow(
+    file_info_query = db.fetchrow(
         "SELECT revn, name FROM file WHERE id = $1",
         file_id,
     )
-    if not file_info_row:
-        return {"error": f"File {file_id} not found"}
-
-    latest_revn = file_info_row["revn"]
     if revn_to is None:
-        revn_to = latest_revn
-
-    if revn_from > revn_to:
-        revn_from, revn_to = revn_to, revn_from
+        file_info_row = await file_info_query
+        if not file_info_row:
+            return {"error": f"File {file_id} not found"}
+        revn_to = file_info_row["revn"]
+        if revn_from > revn_to:
+            revn_from, revn_to = revn_to, revn_from
+        rows = await _fetch_file_changes(
+            file_id, revn_from, revn_to, include_authors, scan_ops
+        )
+    else:
+        # Both bounds known up front — the two queries are independent and
+        # run concurrently on separate pool connections.
+        if revn_from > revn_to:
+            revn_from, revn_to = revn_to, revn_from
+        file_info_row, rows = await db.pipeline(
+            file_info_query,
+            _fetch_file_changes(
+                file_id, revn_from, revn_to, include_authors, scan_ops
+            ),
+        )
+        if not file_info_row:
+            return {"error": f"File {file_id} not found"}
 
-    rows = await db.fetch(
-        """
-        SELECT fc.revn, fc.created_at, fc.label, fc.created_by,
-               pr.fullname as author, pr.email as author_email,
-               length(fc.changes) as changes_bytes,
-               fc.changes
-        FROM file_change fc
-        LEFT JOIN profile pr ON pr.id = fc.profile_id
-        WHERE fc.file_id = $1 AND fc.revn > $2 AND fc.revn <= $3
-        ORDER BY fc.revn ASC
-        """,
-        file_id,
-        revn_from,
-        revn_to,
-    )
+    latest_revn = file_info_row["revn"]
 
     changes_summary = []
     for row in rows:
         change_entry = {
             "revn": row["revn"],
-            "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-            "author": row.get("author"),
-            "created_by": row.get("created_by"),
-            "label": row.get("label"),
-            "changes_bytes": row.get("changes_bytes", 0),
+            "created_at": row["created_at"],
+            "created_by": row["created_by"],
+            "label": row["label"],
+            "changes_bytes": row["changes_bytes"],
         }
-        # Extract operation types from Fressian binary by scanning for known strings
-        raw = row.get("changes")
-        if isinstance(raw, (bytes, bytearray)):
-            change_entry["operation_types"] = _extract_op_types_from_fressian(raw)
+        if include_authors:
+            change_entry["author"] = row["author"]
+        if scan_ops:
+            op_counts = row["op_counts"]
+            if op_counts is not None:
+                change_entry["operation_types"] = _expand_op_counts(op_counts)
         changes_summary.append(change_entry)
 
     return {
@@ -149,32 +166,73 @@ async def compare_revisions(
     }
 
 
+# Optional parts of the file_change query. Operation types are counted inside
+# Postgres by scanning each Fressian blob for known op names, so the blobs
+# themselves never cross the wire; escape encoding leaves ASCII intact, so op
+# names match as in the bytes. op_counts lines up with _KNOWN_OPS and is NULL
+# when there's no blob.
+_OP_COUNTS_COLUMN = """
+               (SELECT array_agg(
+                           (length(t.s) - length(replace(t.s, o.op, '')))
+                           / length(o.op)
+                           ORDER BY o.ord)
+                FROM unnest($4::text[]) WITH ORDINALITY AS o(op, ord)
+                WHERE t.s IS NOT NULL
+               ) as op_counts"""
+_OP_SCAN_JOIN = """
+        CROSS JOIN LATERAL (SELECT encode(fc.changes, 'escape') AS s) t"""
+_AUTHOR_JOIN = """
+        LEFT JOIN profile pr ON pr.id = fc.profile_id"""
+
+
+async def _fetch_file_changes(
+    file_id: str,
+    revn_from: int,
+    revn_to: int,
+    include_authors: bool = True,
+    scan_ops: bool = True,
+) -> list[dict]:
+    """Fetch file_change rows in the (revn_from, revn_to] range.
+
+    The profile join and the op scan are only added when asked for, so a
+    metadata-only comparison is a plain range read of file_change.
+    """
+    columns = """
+        SELECT fc.revn, fc.created_at, fc.label, fc.created_by,
+               length(fc.changes) as changes_bytes"""
+    joins = ""
+    args: list[Any] = [file_id, revn_from, revn_to]
+    if include_authors:
+        columns += ",\n               pr.fullname as author"
+        joins += _AUTHOR_JOIN
+    if scan_ops:
+        columns += "," + _OP_COUNTS_COLUMN
+        joins += _OP_SCAN_JOIN
+        args.append(_KNOWN_OPS)
+    query = f"""{columns}
+        FROM file_change fc{joins}
+        WHERE fc.file_id = $1 AND fc.revn > $2 AND fc.revn <= $3
+        ORDER BY fc.revn ASC
+        """
+    return await db.fetch(query, *args)
+
+
 # Known Penpot change operation types to scan for in Fressian binary
 _KNOWN_OPS = (
-    b"add-obj", b"mod-obj", b"del-obj", b"mov-objects",
-    b"add-page", b"del-page", b"mod-page",
-    b"add-component", b"mod-component", b"del-component",
-    b"add-color", b"mod-color", b"del-color",
-    b"add-typography", b"mod-typography", b"del-typography",
-    b"add-media", b"mod-media", b"del-media",
-    b"reg-objects", b"set-option",
+    "add-obj", "mod-obj", "del-obj", "mov-objects",
+    "add-page", "del-page", "mod-page",
+    "add-component", "mod-component", "del-component",
+    "add-color", "mod-color", "del-color",
+    "add-typography", "mod-typography", "del-typography",
+    "add-media", "mod-media", "del-media",
+    "reg-objects", "set-option",
 )
 
 
-def _extract_op_types_from_fressian(data: bytes) -> list[str]:
-    """Scan Fressian binary for known Penpot operation type strings."""
+def _expand_op_counts(counts: list[int | None]) -> list[str]:
+    """Turn per-op occurrence counts into the op list, one entry per occurrence."""
     found = []
-    for op in _KNOWN_OPS:
-        count = data.count(op)
-        if count > 0:
-            found.extend([op.decode("ascii")] * count)
+    for op, count in zip(_KNOWN_OPS, counts):
+        if count:
+            found.extend([op] * count)
     return found
-
-
-def _safe_get(obj: Any, key: str) -> Any:
-    """Safely get a key from a potentially tagged transit value."""
-    if isinstance(obj, dict):
-        return obj.get(key)
-    if isinstance(obj, list) and len(obj) == 2 and isinstance(obj[1], dict):
-        return obj[1].get(key)
-    return None
@@ -2,13 +2,54 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
 from penpot_mcp.services.api import api
 from penpot_mcp.services.db import db
 
+# Row types for the list tools. orjson encodes slotted dataclasses natively,
+# field order included, so the JSON matches the dicts they replace at a
+# fraction of the memory per row.
+
+
+@dataclass(slots=True)
+class CommentRow:
+    thread_id: str
+    page_name: str | None
+    is_resolved: bool
+    position: Any
+    comment_id: str
+    content: str
+    author: str
+    author_email: str
+    thread_created: datetime | None
+    comment_created: datetime | None
+
+
+@dataclass(slots=True)
+class ActiveUserRow:
+    profile_id: str
+    fullname: str
+    email: str
+    updated_at: datetime | None
+
+
+@dataclass(slots=True)
+class ShareLinkRow:
+    id: str
+    pages: Any
+    flags: Any
+    who_comment: str | None
+    who_inspect: str | None
+    owner: str
+    created_at: datetime | None
+
 
 async def get_comments(
     file_id: str, resolved: bool | None = None
-) -> list[dict]:
+) -> list[CommentRow]:
     """Get all comments on a file, grouped by thread.
 
     Args:
@@ -17,27 +58,23 @@ async def get_comments(
     """
     rows = await db.get_comments(file_id, resolved)
     return [
-        {
-            "thread_id": str(r["thread_id"]),
-            "page_name": r["page_name"],
-            "is_resolved": r["is_resolved"],
-            "position": r.get("position"),
-            "comment_id": str(r["comment_id"]),
-            "content": r["content"],
-            "author": r["author"],
-            "author_email": r["author_email"],
-            "thread_created": (
-                r["thread_created"].isoformat() if r["thread_created"] else None
-            ),
-            "comment_created": (
-                r["comment_created"].isoformat() if r["comment_created"] else None
-            ),
-        }
+        CommentRow(
+            thread_id=str(r["thread_id"]),
+            page_name=r["page_name"],
+            is_resolved=r["is_resolved"],
+            position=r["position"],
+            comment_id=str(r["comment_id"]),
+            content=r["content"],
+            author=r["author"],
+            author_email=r["author_email"],
+            thread_created=r["thread_created"],
+            comment_created=r["comment_created"],
+        )
         for r in rows
     ]
 
 
-async def get_active_users(file_id: str) -> list[dict]:
+async def get_active_users(file_id: str) -> list[ActiveUserRow]:
     """Get users currently present in a file (real-time collaboration).
 
     Args:
@@ -45,17 +82,17 @@ async def get_active_users(file_id: str) -> list[dict]:
     """
     rows = await db.get_active_users(file_id)
     return [
-        {
-            "profile_id": str(r["profile_id"]),
-            "fullname": r["fullname"],
-            "email": r["email"],
-            "updated_at": r["updated_at"].isoformat() if r["updated_at"] else None,
-        }
+        ActiveUserRow(
+            profile_id=str(r["profile_id"]),
+            fullname=r["fullname"],
+            email=r["email"],
+            updated_at=r["updated_at"],
+        )
         for r in rows
     ]
 
 
-async def get_share_links(file_id: str) -> list[dict]:
+async def get_share_links(file_id: str) -> list[ShareLinkRow]:
     """List share links for a file.
 
     Args:
@@ -63,15 +100,15 @@ async def get_share_links(file_id: str) -> list[dict]:
     """
     rows = await db.get_share_links(file_id)
     return [
-        {
-            "id": str(r["id"]),
-            "pages": r.get("pages"),
-            "flags": r.get("flags"),
-            "who_comment": r.get("who_comment"),
-            "who_inspect": r.get("who_inspect"),
-            "owner": r.get("owner"),
-            "created_at": r["created_at"].isoformat() if r["created_at"] else None,
-        }
+        ShareLinkRow(
+            id=str(r["id"]),
+            pages=r["pages"],
+            flags=r["flags"],
+            who_comment=r["who_comment"],
+            who_inspect=r["who_inspect"],
+            owner=r["owner"],
+            created_at=r["created_at"],
+        )
         for r in rows
     ]
 
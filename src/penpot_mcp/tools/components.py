@@ -7,7 +7,7 @@ from penpot_mcp.services.api import api
 
 
 async def _get_file_data(file_id: str) -> dict:
-    return await api.command("get-file", {"id": file_id, "components-v2": True})
+    return await api.get_file_cached(file_id)
 
 
 async def get_component_instances(file_id: str) -> list[dict]:
@@ -2,18 +2,22 @@
 
 from __future__ import annotations
 
+import math
 from typing import Any
 
 from penpot_mcp.services.changes import (
     ROOT_FRAME_ID,
-    apply_changes,
     build_fill,
     build_shape_geometry,
     build_stroke,
     build_text_content,
     change_add_obj,
     change_add_page,
+    change_mod_obj,
+    change_mov_objects,
     new_uuid,
+    set_op,
+    submit_changes,
 )
 
 
@@ -86,6 +90,34 @@ def _base_shape(
     return obj
 
 
+def _build_rectangle(
+    page_id: str,
+    x: float = 0,
+    y: float = 0,
+    width: float = 100,
+    height: float = 100,
+    name: str = "Rectangle",
+    fill_color: str = "#B1B2B5",
+    fill_opacity: float = 1.0,
+    stroke_color: str | None = None,
+    stroke_width: float = 1.0,
+    opacity: float = 1.0,
+    border_radius: float = 0,
+    parent_id: str | None = None,
+) -> tuple[list[dict], dict]:
+    """Build the changes for create_rectangle() and the result it returns."""
+    frame_id = parent_id or ROOT_FRAME_ID
+    obj = _base_shape(
+        "rect", name, x, y, width, height,
+        frame_id=frame_id, parent_id=parent_id,
+        fill_color=fill_color, fill_opacity=fill_opacity,
+        stroke_color=stroke_color, stroke_width=stroke_width,
+        opacity=opacity, border_radius=border_radius,
+    )
+    change = change_add_obj(page_id, frame_id, obj)
+    return [change], {"id": obj["id"], "name": name, "type": "rect"}
+
+
 async def create_rectangle(
     file_id: str,
     page_id: str,
@@ -120,17 +152,51 @@ async def create_rectangle(
         border_radius: Corner radius for all corners (default 0).
         parent_id: Parent shape ID. If omitted, adds to root frame.
     """
+    changes, result = _build_rectangle(
+        page_id=page_id, x=x, y=y, width=width, height=height, name=name,
+        fill_color=fill_color, fill_opacity=fill_opacity, stroke_color=stroke_color,
+        stroke_width=stroke_width, opacity=opacity, border_radius=border_radius,
+        parent_id=parent_id,
+    )
+    await submit_changes(file_id, changes)
+    return result
+
+
+def _build_frame(
+    page_id: str,
+    x: float = 0,
+    y: float = 0,
+    width: float = 300,
+    height: float = 300,
+    name: str = "Frame",
+    fill_color: str = "#FFFFFF",
+    fill_opacity: float = 1.0,
+    stroke_color: str | None = None,
+    stroke_width: float = 1.0,
+    opacity: float = 1.0,
+    border_radius: float = 0,
+    clip_content: bool = True,
+    parent_id: str | None = None,
+) -> tuple[list[dict], dict]:
+    """Build the changes for create_frame() and the result it returns."""
     frame_id = parent_id or ROOT_FRAME_ID
+    extra = {
+        "shapes": [],
+        "hide-in-viewer": False,
+    }
+    if clip_content:
+        extra["clip-content"] = True
+
     obj = _base_shape(
-        "rect", name, x, y, width, height,
+        "frame", name, x, y, width, height,
         frame_id=frame_id, parent_id=parent_id,
         fill_color=fill_color, fill_opacity=fill_opacity,
         stroke_color=stroke_color, stroke_width=stroke_width,
         opacity=opacity, border_radius=border_radius,
+        extra=extra,
     )
     change = change_add_obj(page_id, frame_id, obj)
-    await apply_changes(file_id, [change])
-    return {"id": obj["id"], "name": name, "type": "rect"}
+    return [change], {"id": obj["id"], "name": name, "type": "frame"}
 
 
 async def create_frame(
@@ -171,25 +237,41 @@ async def create_frame(
         clip_content: Whether to clip child content at frame bounds (default true).
         parent_id: Parent frame ID. If omitted, adds to root frame.
     """
-    frame_id = parent_id or ROOT_FRAME_ID
-    extra = {
-        "shapes": [],
-        "hide-in-viewer": False,
-    }
-    if clip_content:
-        extra["clip-content"] = True
+    changes, result = _build_frame(
+        page_id=page_id, x=x, y=y, width=width, height=height, name=name,
+        fill_color=fill_color, fill_opacity=fill_opacity, stroke_color=stroke_color,
+        stroke_width=stroke_width, opacity=opacity, border_radius=border_radius,
+        clip_content=clip_content, parent_id=parent_id,
+    )
+    await submit_changes(file_id, changes)
+    return result
+
 
+def _build_ellipse(
+    page_id: str,
+    x: float = 0,
+    y: float = 0,
+    width: float = 100,
+    height: float = 100,
+    name: str = "Ellipse",
+    fill_color: str = "#B1B2B5",
+    fill_opacity: float = 1.0,
+    stroke_color: str | None = None,
+    stroke_width: float = 1.0,
+    opacity: float = 1.0,
+    parent_id: str | None = None,
+) -> tuple[list[dict], dict]:
+    """Build the changes for create_ellipse() and the result it returns."""
+    frame_id = parent_id or ROOT_FRAME_ID
     obj = _base_shape(
-        "frame", name, x, y, width, height,
+        "circle", name, x, y, width, height,
         frame_id=frame_id, parent_id=parent_id,
         fill_color=fill_color, fill_opacity=fill_opacity,
         stroke_color=stroke_color, stroke_width=stroke_width,
-        opacity=opacity, border_radius=border_radius,
-        extra=extra,
+        opacity=opacity,
     )
     change = change_add_obj(page_id, frame_id, obj)
-    await apply_changes(file_id, [change])
-    return {"id": obj["id"], "name": name, "type": "frame"}
+    return [change], {"id": obj["id"], "name": name, "type": "circle"}
 
 
 async def create_ellipse(
@@ -226,21 +308,16 @@ async def create_ellipse(
         opacity: Overall opacity 0-1 (default 1.0).
         parent_id: Parent shape ID. If omitted, adds to root frame.
     """
-    frame_id = parent_id or ROOT_FRAME_ID
-    obj = _base_shape(
-        "circle", name, x, y, width, height,
-        frame_id=frame_id, parent_id=parent_id,
-        fill_color=fill_color, fill_opacity=fill_opacity,
-        stroke_color=stroke_color, stroke_width=stroke_width,
-        opacity=opacity,
+    changes, result = _build_ellipse(
+        page_id=page_id, x=x, y=y, width=width, height=height, name=name,
+        fill_color=fill_color, fill_opacity=fill_opacity, stroke_color=stroke_color,
+        stroke_width=stroke_width, opacity=opacity, parent_id=parent_id,
     )
-    change = change_add_obj(page_id, frame_id, obj)
-    await apply_changes(file_id, [change])
-    return {"id": obj["id"], "name": name, "type": "circle"}
+    await submit_changes(file_id, changes)
+    return result
 
 
-async def create_text(
-    file_id: str,
+def _build_text(
     page_id: str,
     text: str = "Text",
     x: float = 0,
@@ -260,31 +337,8 @@ async def create_text(
     text_decoration: str = "none",
     opacity: float = 1.0,
     parent_id: str | None = None,
-) -> dict:
-    """Create a text shape on a page.
-
-    Args:
-        file_id: The file UUID.
-        page_id: The page UUID.
-        text: Text content (default "Text").
-        x: X position (default 0).
-        y: Y position (default 0).
-        width: Text box width. If omitted, auto-calculated from text length.
-        height: Text box height. If omitted, auto-calculated from font size.
-        name: Shape name. If omitted, uses the text content.
-        font_family: Font family (default "sourcesanspro"). Use list_fonts to see available fonts.
-        font_size: Font size in pixels (default 16).
-        font_weight: Font weight — "400" (normal), "700" (bold), etc. (default "400").
-        font_style: Font style — "normal" or "italic" (default "normal").
-        fill_color: Text color hex (default "#000000").
-        fill_opacity: Text opacity 0-1 (default 1.0).
-        text_align: Text alignment — "left", "center", "right", "justify" (default "left").
-        line_height: Line height multiplier (default 1.2).
-        letter_spacing: Letter spacing in pixels (default 0).
-        text_decoration: Text decoration — "none", "underline", "line-through" (default "none").
-        opacity: Overall shape opacity 0-1 (default 1.0).
-        parent_id: Parent shape ID. If omitted, adds to root frame.
-    """
+) -> tuple[list[dict], dict]:
+    """Build the changes for create_text() and the result it returns."""
     frame_id = parent_id or ROOT_FRAME_ID
     # Auto-size based on text content
     if width is None:
@@ -324,45 +378,96 @@ async def create_text(
         obj["opacity"] = opacity
 
     change = change_add_obj(page_id, frame_id, obj)
-    await apply_changes(file_id, [change])
-    return {"id": shape_id, "name": obj["name"], "type": "text"}
+    return [change], {"id": shape_id, "name": obj["name"], "type": "text"}
 
 
-async def create_path(
+async def create_text(
     file_id: str,
     page_id: str,
-    segments: list[dict],
-    name: str = "Path",
-    fill_color: str | None = None,
+    text: str = "Text",
+    x: float = 0,
+    y: float = 0,
+    width: float | None = None,
+    height: float | None = None,
+    name: str | None = None,
+    font_family: str = "sourcesanspro",
+    font_size: int = 16,
+    font_weight: str = "400",
+    font_style: str = "normal",
+    fill_color: str = "#000000",
     fill_opacity: float = 1.0,
-    stroke_color: str = "#000000",
-    stroke_width: float = 1.0,
+    text_align: str = "left",
+    line_height: float = 1.2,
+    letter_spacing: float = 0,
+    text_decoration: str = "none",
     opacity: float = 1.0,
     parent_id: str | None = None,
 ) -> dict:
-    """Create a vector path shape.
+    """Create a text shape on a page.
 
     Args:
         file_id: The file UUID.
         page_id: The page UUID.
-        segments: Path segments — list of dicts with keys: command ("M"=move, "L"=line, "C"=curve, "Z"=close), x, y, and optionally c1x, c1y, c2x, c2y for curves. Example: [{"command":"M","x":0,"y":0}, {"command":"L","x":100,"y":100}].
-        name: Shape name (default "Path").
-        fill_color: Optional fill color hex.
-        fill_opacity: Fill opacity 0-1 (default 1.0).
-        stroke_color: Stroke color hex (default "#000000").
-        stroke_width: Stroke width in pixels (default 1.0).
-        opacity: Overall opacity 0-1 (default 1.0).
+        text: Text content (default "Text").
+        x: X position (default 0).
+        y: Y position (default 0).
+        width: Text box width. If omitted, auto-calculated from text length.
+        height: Text box height. If omitted, auto-calculated from font size.
+        name: Shape name. If omitted, uses the text content.
+        font_family: Font family (default "sourcesanspro"). Use list_fonts to see available fonts.
+        font_size: Font size in pixels (default 16).
+        font_weight: Font weight — "400" (normal), "700" (bold), etc. (default "400").
+        font_style: Font style — "normal" or "italic" (default "normal").
+        fill_color: Text color hex (default "#000000").
+        fill_opacity: Text opacity 0-1 (default 1.0).
+        text_align: Text alignment — "left", "center", "right", "justify" (default "left").
+        line_height: Line height multiplier (default 1.2).
+        letter_spacing: Letter spacing in pixels (default 0).
+        text_decoration: Text decoration — "none", "underline", "line-through" (default "none").
+        opacity: Overall shape opacity 0-1 (default 1.0).
         parent_id: Parent shape ID. If omitted, adds to root frame.
     """
+    changes, result = _build_text(
+        page_id=page_id, text=text, x=x, y=y, width=width, height=height, name=name,
+        font_family=font_family, font_size=font_size, font_weight=font_weight,
+        font_style=font_style, fill_color=fill_color, fill_opacity=fill_opacity,
+        text_align=text_align, line_height=line_height, letter_spacing=letter_spacing,
+        text_decoration=text_decoration, opacity=opacity, parent_id=parent_id,
+    )
+    await submit_changes(file_id, changes)
+    return result
+
+
+def _build_path(
+    page_id: str,
+    segments: list[dict],
+    name: str = "Path",
+    fill_color: str | None = None,
+    fill_opacity: float = 1.0,
+    stroke_color: str = "#000000",
+    stroke_width: float = 1.0,
+    opacity: float = 1.0,
+    parent_id: str | None = None,
+) -> tuple[list[dict], dict]:
+    """Build the changes for create_path() and the result it returns."""
     frame_id = parent_id or ROOT_FRAME_ID
 
-    # Calculate bounding box from segments
-    xs = [s["x"] for s in segments if "x" in s]
-    ys = [s["y"] for s in segments if "y" in s]
-    min_x = min(xs) if xs else 0
-    min_y = min(ys) if ys else 0
-    max_x = max(xs) if xs else 100
-    max_y = max(ys) if ys else 100
+    # Calculate bounding box from segments, in one pass
+    min_x = min_y = math.inf
+    max_x = max_y = -math.inf
+    for seg in segments:
+        x = seg.get("x")
+        if x is not None:
+            min_x = min(min_x, x)
+            max_x = max(max_x, x)
+        y = seg.get("y")
+        if y is not None:
+            min_y = min(min_y, y)
+            max_y = max(max_y, y)
+    if min_x == math.inf:
+        min_x, max_x = 0, 100
+    if min_y == math.inf:
+        min_y, max_y = 0, 100
     w = max(max_x - min_x, 1)
     h = max(max_y - min_y, 1)
 
@@ -409,28 +514,51 @@ async def create_path(
         obj["opacity"] = opacity
 
     change = change_add_obj(page_id, frame_id, obj)
-    await apply_changes(file_id, [change])
-    return {"id": shape_id, "name": name, "type": "path"}
+    return [change], {"id": shape_id, "name": name, "type": "path"}
 
 
-async def create_group(
+async def create_path(
     file_id: str,
     page_id: str,
-    shape_ids: list[str],
-    name: str = "Group",
+    segments: list[dict],
+    name: str = "Path",
+    fill_color: str | None = None,
+    fill_opacity: float = 1.0,
+    stroke_color: str = "#000000",
+    stroke_width: float = 1.0,
+    opacity: float = 1.0,
     parent_id: str | None = None,
 ) -> dict:
-    """Group existing shapes together.
+    """Create a vector path shape.
 
     Args:
         file_id: The file UUID.
         page_id: The page UUID.
-        shape_ids: List of shape UUIDs to include in the group.
-        name: Group name (default "Group").
-        parent_id: Parent shape ID. If omitted, uses root frame.
+        segments: Path segments — list of dicts with keys: command ("M"=move, "L"=line, "C"=curve, "Z"=close), x, y, and optionally c1x, c1y, c2x, c2y for curves. Example: [{"command":"M","x":0,"y":0}, {"command":"L","x":100,"y":100}].
+        name: Shape name (default "Path").
+        fill_color: Optional fill color hex.
+        fill_opacity: Fill opacity 0-1 (default 1.0).
+        stroke_color: Stroke color hex (default "#000000").
+        stroke_width: Stroke width in pixels (default 1.0).
+        opacity: Overall opacity 0-1 (default 1.0).
+        parent_id: Parent shape ID. If omitted, adds to root frame.
     """
-    from penpot_mcp.services.changes import change_mov_objects
+    changes, result = _build_path(
+        page_id=page_id, segments=segments, name=name, fill_color=fill_color,
+        fill_opacity=fill_opacity, stroke_color=stroke_color, stroke_width=stroke_width,
+        opacity=opacity, parent_id=parent_id,
+    )
+    await submit_changes(file_id, changes)
+    return result
 
+
+def _build_group(
+    page_id: str,
+    shape_ids: list[str],
+    name: str = "Group",
+    parent_id: str | None = None,
+) -> tuple[list[dict], dict]:
+    """Build the changes for create_group() and the result it returns."""
     frame_id = parent_id or ROOT_FRAME_ID
 
     # Create group shape — uses first shape's position as approximate bounds
@@ -451,26 +579,39 @@ async def create_group(
         change_add_obj(page_id, frame_id, obj),
         change_mov_objects(page_id, shape_id, shape_ids),
     ]
-    await apply_changes(file_id, changes)
-    return {"id": shape_id, "name": name, "type": "group"}
+    return changes, {"id": shape_id, "name": name, "type": "group"}
 
 
-async def create_component(
+async def create_group(
     file_id: str,
     page_id: str,
-    shape_id: str,
-    name: str | None = None,
+    shape_ids: list[str],
+    name: str = "Group",
+    parent_id: str | None = None,
 ) -> dict:
-    """Convert an existing shape/frame into a component.
+    """Group existing shapes together.
 
     Args:
         file_id: The file UUID.
         page_id: The page UUID.
-        shape_id: The shape UUID to convert to a component.
-        name: Component name. If omitted, keeps the shape's current name.
+        shape_ids: List of shape UUIDs to include in the group.
+        name: Group name (default "Group").
+        parent_id: Parent shape ID. If omitted, uses root frame.
     """
-    from penpot_mcp.services.changes import change_mod_obj, set_op
+    changes, result = _build_group(
+        page_id=page_id, shape_ids=shape_ids, name=name, parent_id=parent_id,
+    )
+    await submit_changes(file_id, changes)
+    return result
 
+
+def _build_component(
+    file_id: str,
+    page_id: str,
+    shape_id: str,
+    name: str | None = None,
+) -> tuple[list[dict], dict]:
+    """Build the changes for create_component() and the result it returns."""
     component_id = new_uuid()
     ops = [
         set_op("component-id", component_id),
@@ -482,8 +623,28 @@ async def create_component(
         ops.append(set_op("name", name))
 
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
-    return {"component_id": component_id, "shape_id": shape_id, "name": name}
+    return [change], {"component_id": component_id, "shape_id": shape_id, "name": name}
+
+
+async def create_component(
+    file_id: str,
+    page_id: str,
+    shape_id: str,
+    name: str | None = None,
+) -> dict:
+    """Convert an existing shape/frame into a reusable component.
+
+    Args:
+        file_id: The file UUID.
+        page_id: The page UUID.
+        shape_id: The shape UUID to convert to a component.
+        name: Component name. If omitted, keeps the shape's current name.
+    """
+    changes, result = _build_component(
+        file_id=file_id, page_id=page_id, shape_id=shape_id, name=name,
+    )
+    await submit_changes(file_id, changes)
+    return result
 
 
 async def create_page(
@@ -498,5 +659,51 @@ async def create_page(
     """
     page_id = new_uuid()
     change = change_add_page(page_id, name)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"id": page_id, "name": name}
+
+
+_SHAPE_BUILDERS = {
+    "rect": _build_rectangle,
+    "frame": _build_frame,
+    "ellipse": _build_ellipse,
+    "text": _build_text,
+    "path": _build_path,
+}
+
+
+async def create_shapes(file_id: str, page_id: str, shapes: list[dict]) -> list[dict]:
+    """Create several shapes on a page with a single file update.
+
+    All shapes are built first; an invalid spec raises before anything is
+    sent, and the changes are then applied together, in list order, so
+    either every shape is created or none is.
+
+    Args:
+        file_id: The file UUID.
+        page_id: The page UUID.
+        shapes: List of shape specs, each {"type": "rect"|"frame"|"ellipse"|"text"|"path", ...}
+            where the other keys are the arguments of the matching create_* tool
+            (without file_id/page_id). Example: [{"type":"rect","x":0,"y":0}, {"type":"text","text":"Hi","x":0,"y":120}].
+    """
+    changes: list[dict] = []
+    results: list[dict] = []
+    for i, spec in enumerate(shapes):
+        kwargs = dict(spec)
+        shape_type = kwargs.pop("type", None)
+        builder = _SHAPE_BUILDERS.get(shape_type)
+        if builder is None:
+            raise ValueError(
+                f"shapes[{i}]: unknown type {shape_type!r}, "
+                f"expected one of {', '.join(_SHAPE_BUILDERS)}"
+            )
+        try:
+            shape_changes, result = builder(page_id, **kwargs)
+        except (TypeError, KeyError, AttributeError) as e:
+            raise ValueError(f"shapes[{i}]: invalid spec: {e!r}") from None
+        changes.extend(shape_changes)
+        results.append(result)
+    if changes:
+        # One submission, so the shapes stay a single atomic update
+        await submit_changes(file_id, changes)
+    return results
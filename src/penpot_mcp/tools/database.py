@@ -2,8 +2,15 @@
 
 from __future__ import annotations
 
+import re
+
 from penpot_mcp.services.db import db
 
+_SELECT_RE = re.compile(r"\s*select", re.IGNORECASE)
+_FORBIDDEN_RE = re.compile(
+    r"\b(insert|update|delete|drop|alter|truncate|create)\b", re.IGNORECASE
+)
+
 
 async def query_database(sql: str) -> list[dict]:
     """Execute a read-only SQL query against the Penpot database.
@@ -14,32 +21,18 @@ async def query_database(sql: str) -> list[dict]:
     Args:
         sql: SQL SELECT query to execute.
     """
-    normalized = sql.strip().lower()
-    if not normalized.startswith("select"):
+    if not _SELECT_RE.match(sql):
         return [{"error": "Only SELECT queries are allowed for safety"}]
 
     # Block dangerous patterns
-    forbidden = ["insert", "update", "delete", "drop", "alter", "truncate", "create"]
-    for word in forbidden:
-        if f" {word} " in f" {normalized} " or normalized.startswith(word):
-            return [{"error": f"Forbidden SQL keyword: {word}"}]
-
-    rows = await db.fetch(sql)
-    # Convert non-serializable types
-    result = []
-    for row in rows:
-        clean = {}
-        for k, v in row.items():
-            if hasattr(v, "isoformat"):
-                clean[k] = v.isoformat()
-            elif isinstance(v, bytes):
-                clean[k] = f"<binary {len(v)} bytes>"
-            elif isinstance(v, (dict, list, str, int, float, bool)) or v is None:
-                clean[k] = v
-            else:
-                clean[k] = str(v)
-        result.append(clean)
-    return result
+    forbidden = _FORBIDDEN_RE.search(sql)
+    if forbidden:
+        return [{"error": f"Forbidden SQL keyword: {forbidden.group(1).lower()}"}]
+
+    # Ad-hoc SQL would only evict the hot tool queries from the cache
+    # Rows are returned as-is: the server's JSON encoder handles datetimes
+    # and UUIDs natively and maps numeric/bytea values in a single pass.
+    return await db.fetch_uncached(sql)
 
 
 async def get_webhooks(team_id: str) -> list[dict]:
@@ -55,9 +48,9 @@ async def get_webhooks(team_id: str) -> list[dict]:
             "uri": r["uri"],
             "mtype": r["mtype"],
             "is_active": r["is_active"],
-            "error_code": r.get("error_code"),
-            "error_count": r.get("error_count"),
-            "created_at": r["created_at"].isoformat() if r["created_at"] else None,
+            "error_code": r["error_code"],
+            "error_count": r["error_count"],
+            "created_at": r["created_at"],
         }
         for r in rows
     ]
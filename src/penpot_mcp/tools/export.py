@@ -7,6 +7,7 @@ import logging
 
 from penpot_mcp.services.api import api
 from penpot_mcp.tools.shapes import get_shape_tree
+from penpot_mcp.transformers.svg import shapes_to_svg_document
 
 logger = logging.getLogger(__name__)
 
@@ -69,8 +70,6 @@ async def export_frame(
 
 async def _fallback_svg_export(file_id: str, page_id: str, object_id: str) -> dict:
     """Generate SVG locally from shape data when the exporter is unavailable."""
-    from penpot_mcp.transformers.svg import shapes_to_svg_document
-
     tree = await get_shape_tree(file_id, page_id, root_id=object_id, depth=10)
     if "error" in tree:
         return tree
@@ -104,7 +103,9 @@ async def export_frame_png(
     object_id: str,
     scale: float = 1.0,
 ) -> dict:
-    """Export a frame or shape to PNG.
+    """Export a frame or shape to PNG via Penpot's exporter (headless Chromium).
+
+    Returns base64-encoded PNG data. Use scale=2.0 for retina quality.
 
     Args:
         file_id: The file UUID.
@@ -122,6 +123,9 @@ async def export_frame_svg(
 ) -> dict:
     """Export a frame or shape to SVG.
 
+    Uses Penpot's exporter for pixel-perfect SVG; falls back to local
+    SVG generation from shape data if the exporter is unavailable.
+
     Args:
         file_id: The file UUID.
         page_id: The page UUID.
@@ -8,7 +8,7 @@ from penpot_mcp.services.db import db
 
 
 async def get_file_summary(file_id: str) -> dict | None:
-    """Get detailed metadata for a file including counts and library info.
+    """Get detailed metadata for a file (counts, team, project, versions, libraries).
 
     Args:
         file_id: The file UUID.
@@ -26,12 +26,12 @@ async def get_file_summary(file_id: str) -> dict | None:
         "revn": r["revn"],
         "vern": r["vern"],
         "version": r["version"],
-        "features": r.get("features"),
+        "features": r["features"],
         "media_count": r["media_count"],
         "comment_count": r["comment_count"],
         "library_count": r["library_count"],
-        "created_at": r["created_at"].isoformat() if r["created_at"] else None,
-        "modified_at": r["modified_at"].isoformat() if r["modified_at"] else None,
+        "created_at": r["created_at"],
+        "modified_at": r["modified_at"],
     }
 
 
@@ -44,10 +44,7 @@ async def get_file_pages(file_id: str) -> list[dict]:
     Args:
         file_id: The file UUID.
     """
-    file_data = await api.command(
-        "get-file",
-        {"id": file_id, "components-v2": True},
-    )
+    file_data = await api.get_file_cached(file_id)
     if not isinstance(file_data, dict):
         return [{"error": "Could not parse file data"}]
 
@@ -81,10 +78,10 @@ async def get_file_history(file_id: str, limit: int = 20) -> list[dict]:
         {
             "id": str(r["id"]),
             "revn": r["revn"],
-            "label": r.get("label"),
-            "profile_name": r.get("profile_name"),
-            "profile_email": r.get("profile_email"),
-            "created_at": r["created_at"].isoformat() if r["created_at"] else None,
+            "label": r["label"],
+            "profile_name": r["profile_name"],
+            "profile_email": r["profile_email"],
+            "created_at": r["created_at"],
         }
         for r in rows
     ]
@@ -102,12 +99,8 @@ async def get_file_libraries(file_id: str) -> list[dict]:
             "library_file_id": str(r["library_file_id"]),
             "library_name": r["library_name"],
             "is_shared": r["is_shared"],
-            "synced_at": r["synced_at"].isoformat() if r["synced_at"] else None,
-            "library_modified_at": (
-                r["library_modified_at"].isoformat()
-                if r["library_modified_at"]
-                else None
-            ),
+            "synced_at": r["synced_at"],
+            "library_modified_at": r["library_modified_at"],
         }
         for r in rows
     ]
@@ -21,7 +21,7 @@ async def list_media_assets(file_id: str) -> list[dict]:
             "height": r["height"],
             "mtype": r["mtype"],
             "is_local": r["is_local"],
-            "created_at": r["created_at"].isoformat() if r["created_at"] else None,
+            "created_at": r["created_at"],
         }
         for r in rows
     ]
@@ -40,7 +40,7 @@ async def list_fonts(team_id: str) -> list[dict]:
             "font_family": r["font_family"],
             "font_weight": r["font_weight"],
             "font_style": r["font_style"],
-            "created_at": r["created_at"].isoformat() if r["created_at"] else None,
+            "created_at": r["created_at"],
         }
         for r in rows
     ]
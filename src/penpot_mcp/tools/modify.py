@@ -4,7 +4,6 @@ from __future__ import annotations
 
 
 from penpot_mcp.services.changes import (
-    apply_changes,
     build_fill,
     build_stroke,
     change_del_obj,
@@ -13,6 +12,7 @@ from penpot_mcp.services.changes import (
     change_mod_page,
     change_mov_objects,
     set_op,
+    submit_changes,
 )
 
 
@@ -32,7 +32,7 @@ async def modify_shape(
     """
     ops = [set_op(k, v) for k, v in attrs.items()]
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"shape_id": shape_id, "modified_attrs": list(attrs.keys())}
 
 
@@ -54,7 +54,7 @@ async def move_shape(
     """
     ops = [set_op("x", x), set_op("y", y)]
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"shape_id": shape_id, "x": x, "y": y}
 
 
@@ -76,7 +76,7 @@ async def resize_shape(
     """
     ops = [set_op("width", width), set_op("height", height)]
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"shape_id": shape_id, "width": width, "height": height}
 
 
@@ -93,7 +93,7 @@ async def delete_shape(
         shape_id: The shape UUID to delete.
     """
     change = change_del_obj(page_id, shape_id)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"deleted": shape_id}
 
 
@@ -113,7 +113,7 @@ async def rename_shape(
     """
     ops = [set_op("name", name)]
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"shape_id": shape_id, "name": name}
 
 
@@ -136,7 +136,7 @@ async def set_fill(
     fills = [build_fill(color=color, opacity=opacity)]
     ops = [set_op("fills", fills)]
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"shape_id": shape_id, "fill_color": color, "fill_opacity": opacity}
 
 
@@ -163,7 +163,7 @@ async def set_stroke(
     strokes = [build_stroke(color=color, width=width, opacity=opacity, style=style)]
     ops = [set_op("strokes", strokes)]
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"shape_id": shape_id, "stroke_color": color, "stroke_width": width}
 
 
@@ -183,7 +183,7 @@ async def set_opacity(
     """
     ops = [set_op("opacity", opacity)]
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"shape_id": shape_id, "opacity": opacity}
 
 
@@ -199,7 +199,7 @@ async def set_layout(
     justify_content: str | None = None,
     wrap: str = "nowrap",
 ) -> dict:
-    """Set flex layout on a frame, turning it into an auto-layout container.
+    """Set flex/grid layout on a frame, turning it into an auto-layout container.
 
     Args:
         file_id: The file UUID.
@@ -228,7 +228,7 @@ async def set_layout(
         ops.append(set_op("layout-justify-content", justify_content))
 
     change = change_mod_obj(page_id, frame_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {
         "frame_id": frame_id,
         "layout": layout_type,
@@ -254,7 +254,7 @@ async def reorder_shapes(
         index: Target index position within the parent (default 0 = bottom).
     """
     change = change_mov_objects(page_id, parent_id, shape_ids, index)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {
         "parent_id": parent_id,
         "moved_shapes": shape_ids,
@@ -273,7 +273,7 @@ async def delete_page(
         page_id: The page UUID to delete.
     """
     change = change_del_page(page_id)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"deleted_page": page_id}
 
 
@@ -290,5 +290,5 @@ async def rename_page(
         name: New name for the page.
     """
     change = change_mod_page(page_id, name)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"page_id": page_id, "name": name}
@@ -19,8 +19,8 @@ async def list_teams() -> list[dict]:
             "is_default": r["is_default"],
             "member_count": r["member_count"],
             "project_count": r["project_count"],
-            "features": r.get("features"),
-            "created_at": r["created_at"].isoformat() if r["created_at"] else None,
+            "features": r["features"],
+            "created_at": r["created_at"],
         }
         for r in rows
     ]
@@ -41,8 +41,8 @@ async def list_projects(team_id: str | None = None) -> list[dict]:
             "team_name": r["team_name"],
             "is_default": r["is_default"],
             "file_count": r["file_count"],
-            "created_at": r["created_at"].isoformat() if r["created_at"] else None,
-            "modified_at": r["modified_at"].isoformat() if r["modified_at"] else None,
+            "created_at": r["created_at"],
+            "modified_at": r["modified_at"],
         }
         for r in rows
     ]
@@ -65,8 +65,8 @@ async def list_files(project_id: str) -> list[dict]:
             "revn": r["revn"],
             "media_count": r["media_count"],
             "comment_count": r["comment_count"],
-            "created_at": r["created_at"].isoformat() if r["created_at"] else None,
-            "modified_at": r["modified_at"].isoformat() if r["modified_at"] else None,
+            "created_at": r["created_at"],
+            "modified_at": r["modified_at"],
         }
         for r in rows
     ]
@@ -86,7 +86,7 @@ async def search_files(query: str) -> list[dict]:
             "project_id": str(r["project_id"]),
             "project_name": r["project_name"],
             "is_shared": r["is_shared"],
-            "modified_at": r["modified_at"].isoformat() if r["modified_at"] else None,
+            "modified_at": r["modified_at"],
         }
         for r in rows
     ]
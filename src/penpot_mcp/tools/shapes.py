@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 from typing import Any
 
 from penpot_mcp.services.api import api
+from penpot_mcp.services.changes import ROOT_FRAME_ID
 from penpot_mcp.services.transit import decode_transit
 
 
@@ -86,7 +88,7 @@ def _get_page_objects(file_data: dict, page_id: str) -> dict[str, dict]:
 
 async def _get_file_data(file_id: str) -> dict:
     """Fetch and return file data dict."""
-    return await api.command("get-file", {"id": file_id, "components-v2": True})
+    return await api.get_file_cached(file_id)
 
 
 async def get_page_objects(
@@ -99,17 +101,22 @@ async def get_page_objects(
         page_id: The page UUID within the file.
         shape_type: Optional filter — one of: rect, circle, frame, text, group, path, image, svg-raw, bool.
     """
+    return [obj async for obj in iter_page_objects(file_id, page_id, shape_type)]
+
+
+async def iter_page_objects(
+    file_id: str, page_id: str, shape_type: str | None = None
+) -> AsyncIterator[dict]:
+    """Yield brief page objects one at a time (see get_page_objects)."""
     file_data = await _get_file_data(file_id)
     objects = _get_page_objects(file_data, page_id)
 
-    result = []
     for obj_id, obj in objects.items():
         obj_type = obj.get("type", "")
         if shape_type:
             if obj_type != shape_type and obj_type != f":{shape_type}":
                 continue
-        result.append(_serialize_shape_brief(obj))
-    return result
+        yield _serialize_shape_brief(obj)
 
 
 async def get_shape_tree(
@@ -127,8 +134,7 @@ async def get_shape_tree(
     objects = _get_page_objects(file_data, page_id)
 
     if not root_id:
-        # Root frame uses the zero UUID convention in Penpot
-        root_id = "00000000-0000-0000-0000-000000000000"
+        root_id = ROOT_FRAME_ID
 
     def build_tree(shape_id: str, current_depth: int) -> dict | None:
         shape = objects.get(shape_id)
@@ -151,7 +157,7 @@ async def get_shape_tree(
 
 
 async def get_shape_details(file_id: str, page_id: str, shape_id: str) -> dict:
-    """Get full details of a specific shape including fills, strokes, text content.
+    """Get full details of a specific shape (fills, strokes, layout, text content).
 
     Args:
         file_id: The file UUID.
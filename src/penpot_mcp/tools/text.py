@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 from penpot_mcp.services.changes import (
-    apply_changes,
     build_text_content,
     change_mod_obj,
     set_op,
+    submit_changes,
 )
+from penpot_mcp.tools.shapes import get_shape_details
 
 
 async def set_text_content(
@@ -44,7 +45,7 @@ async def set_text_content(
     )
     ops = [set_op("content", content)]
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"shape_id": shape_id, "text": text}
 
 
@@ -66,7 +67,6 @@ async def set_font(
         font_family: Font family name (e.g., "sourcesanspro", "roboto").
     """
     # We need to get the existing text first
-    from penpot_mcp.tools.shapes import get_shape_details
     shape = await get_shape_details(file_id, page_id, shape_id)
     if "error" in shape:
         return shape
@@ -79,7 +79,7 @@ async def set_font(
     )
     ops = [set_op("content", content)]
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"shape_id": shape_id, "font_family": font_family}
 
 
@@ -97,7 +97,6 @@ async def set_font_size(
         shape_id: The text shape UUID.
         font_size: Font size in pixels.
     """
-    from penpot_mcp.tools.shapes import get_shape_details
     shape = await get_shape_details(file_id, page_id, shape_id)
     if "error" in shape:
         return shape
@@ -110,7 +109,7 @@ async def set_font_size(
     )
     ops = [set_op("content", content)]
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"shape_id": shape_id, "font_size": font_size}
 
 
@@ -128,7 +127,6 @@ async def set_text_align(
         shape_id: The text shape UUID.
         align: Text alignment — "left", "center", "right", or "justify".
     """
-    from penpot_mcp.tools.shapes import get_shape_details
     shape = await get_shape_details(file_id, page_id, shape_id)
     if "error" in shape:
         return shape
@@ -141,7 +139,7 @@ async def set_text_align(
     )
     ops = [set_op("content", content)]
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {"shape_id": shape_id, "text_align": align}
 
 
@@ -163,7 +161,6 @@ async def set_text_style(
         font_style: Font style — "normal" or "italic" (optional).
         text_decoration: Text decoration — "none", "underline", "line-through" (optional).
     """
-    from penpot_mcp.tools.shapes import get_shape_details
     shape = await get_shape_details(file_id, page_id, shape_id)
     if "error" in shape:
         return shape
@@ -181,7 +178,7 @@ async def set_text_style(
     content = build_text_content(**kwargs)
     ops = [set_op("content", content)]
     change = change_mod_obj(page_id, shape_id, ops)
-    await apply_changes(file_id, [change])
+    await submit_changes(file_id, [change])
     return {
         "shape_id": shape_id,
         "font_weight": font_weight,
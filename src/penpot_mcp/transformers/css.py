@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import math
+
 
 def shape_to_css(shape: dict) -> dict[str, str]:
     """Convert a Penpot shape's visual properties to CSS properties.
@@ -162,8 +164,6 @@ def _gradient_to_css(gradient: dict) -> str:
         start_y = gradient.get("start-y", 0)
         end_x = gradient.get("end-x", 0.5)
         end_y = gradient.get("end-y", 1)
-        import math
-
         angle = math.degrees(math.atan2(end_y - start_y, end_x - start_x)) - 90
         return f"linear-gradient({round(angle)}deg, {', '.join(stop_strs)})"
     else:
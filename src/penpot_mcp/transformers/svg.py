@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from penpot_mcp.tools.shapes import _extract_text_content
+
 
 def shape_to_svg(shape: dict) -> str:
     """Convert a Penpot shape to an SVG element string.
@@ -41,8 +43,6 @@ def shape_to_svg(shape: dict) -> str:
         return f'<ellipse cx="{cx}" cy="{cy}" rx="{rx_val}" ry="{ry_val}"{attrs} />'
 
     if shape_type == "text":
-        from penpot_mcp.tools.shapes import _extract_text_content
-
         text = _extract_text_content(shape.get("content", {}))
         font_size = 16
         content = shape.get("content", {})
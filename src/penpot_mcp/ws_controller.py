@@ -1,11 +1,11 @@
 """WebSocket Controller for Penpot MCP Interactive Channel."""
 
 import asyncio
-import json
 import logging
 import uuid
 from typing import Any, Dict, Optional
 
+import orjson
 import websockets
 
 from penpot_mcp.config import settings
@@ -38,9 +38,9 @@ class PenpotWSController:
         try:
             async for message in websocket:
                 try:
-                    data = json.loads(message)
+                    data = orjson.loads(message)
                     self._handle_plugin_message(data)
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     logger.warning("Received non-JSON message from plugin.")
         except websockets.exceptions.ConnectionClosed:
             logger.info("Plugin disconnected normally.")
@@ -70,9 +70,10 @@ class PenpotWSController:
         if not self.is_connected:
             return False
 
-        payload = json.dumps(
+        # Decoded to str so the plugin still receives a text frame
+        payload = orjson.dumps(
             {"type": "execute", "command_id": str(uuid.uuid4()), "script": script}
-        )
+        ).decode()
 
         # Broadcast to all connected plugins (usually just 1)
         for ws in list(self.active_connections):
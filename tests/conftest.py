@@ -9,8 +9,17 @@ from penpot_mcp.services.db import db
 
 
 @pytest_asyncio.fixture(scope="session", autouse=True, loop_scope="session")
-async def setup_services():
-    """Connect to Penpot DB and API once for the entire test session."""
+async def setup_services(request):
+    """Connect to Penpot DB and API once for the entire test session.
+
+    Skipped when only unit tests (no ``integration`` marker) were collected,
+    so those run without a live Penpot instance.
+    """
+    if not any(
+        item.get_closest_marker("integration") for item in request.session.items
+    ):
+        yield
+        return
     await db.connect()
     await api.connect()
     yield
@@ -0,0 +1,41 @@
+"""Unit tests for the in-memory response cache."""
+
+from __future__ import annotations
+
+from penpot_mcp.services import cache
+from penpot_mcp.services.cache import ResponseCache
+
+
+def test_evicts_least_recently_used():
+    c = ResponseCache(maxsize=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1  # "b" is now the oldest
+    c.set("c", 3)
+
+    assert c.get("b") is None
+    assert c.get("a") == 1
+    assert c.get("c") == 3
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    c = ResponseCache(ttl=30.0)
+    c.set("k", "v")
+
+    now = 129.0
+    assert c.get("k") == "v"
+    now = 131.0
+    assert c.get("k") is None
+
+
+def test_discard_and_clear():
+    c = ResponseCache()
+    c.set("a", 1)
+    c.set("b", 2)
+    c.discard("a")
+    c.discard("missing")
+    assert c.get("a") is None
+    c.clear()
+    assert c.get("b") is None
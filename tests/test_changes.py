@@ -0,0 +1,192 @@
+"""Unit tests for change submission and batching (no live Penpot needed)."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import orjson
+import pytest
+
+from penpot_mcp.services import changes
+from penpot_mcp.services.changes import ChangeBatcher
+
+
+def _rpc_error(code: str) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://penpot/api/rpc/command/update-file")
+    response = httpx.Response(
+        400,
+        request=request,
+        headers={"content-type": "application/transit+json"},
+        content=orjson.dumps(["^ ", "~:type", "~:validation", "~:code", f"~:{code}"]),
+    )
+    return httpx.HTTPStatusError("rejected", request=request, response=response)
+
+
+class _FakeApply:
+    """Stand-in for apply_changes that records calls and rejects bad changes."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, list[dict]]] = []
+        self.error: Exception | None = None
+
+    async def __call__(self, file_id: str, batch: list[dict]) -> dict:
+        self.calls.append((file_id, list(batch)))
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        if any(c.get("bad") for c in batch):
+            raise _rpc_error("schema-validation")
+        return {"revn": len(self.calls)}
+
+
+@pytest.fixture
+def fake_apply(monkeypatch):
+    fake = _FakeApply()
+    monkeypatch.setattr(changes, "apply_changes", fake)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions_share_one_update(fake_apply):
+    batcher = ChangeBatcher(delay=0.001)
+    results = await asyncio.gather(
+        batcher.submit("f1", [{"id": 1}]),
+        batcher.submit("f1", [{"id": 2}, {"id": 3}]),
+        batcher.submit("f2", [{"id": 4}]),
+    )
+
+    assert sorted(fake_apply.calls) == [
+        ("f1", [{"id": 1}, {"id": 2}, {"id": 3}]),
+        ("f2", [{"id": 4}]),
+    ]
+    assert results[0] is results[1]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_only_fails_the_bad_submission(fake_apply):
+    batcher = ChangeBatcher(delay=0.001)
+    good_1, bad, good_2 = await asyncio.gather(
+        batcher.submit("f1", [{"id": 1}]),
+        batcher.submit("f1", [{"id": 2, "bad": True}]),
+        batcher.submit("f1", [{"id": 3}]),
+        return_exceptions=True,
+    )
+
+    assert isinstance(bad, httpx.HTTPStatusError)
+    assert isinstance(good_1, dict) and isinstance(good_2, dict)
+    # The combined attempt, then each submission on its own
+    assert [c for _, c in fake_apply.calls] == [
+        [{"id": 1}, {"id": 2, "bad": True}, {"id": 3}],
+        [{"id": 1}],
+        [{"id": 2, "bad": True}],
+        [{"id": 3}],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_not_resent_when_outcome_is_unknown(fake_apply):
+    fake_apply.error = httpx.ReadTimeout("timed out")
+    batcher = ChangeBatcher(delay=0.001)
+    results = await asyncio.gather(
+        batcher.submit("f1", [{"id": 1}]),
+        batcher.submit("f1", [{"id": 2}]),
+        return_exceptions=True,
+    )
+
+    assert all(r is fake_apply.error for r in results)
+    assert len(fake_apply.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_updates_to_one_file_never_overlap(monkeypatch):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_apply(file_id, batch):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {}
+
+    monkeypatch.setattr(changes, "apply_changes", slow_apply)
+    batcher = ChangeBatcher(delay=0.001)
+
+    first = asyncio.ensure_future(batcher.submit("f1", [{"id": 1}]))
+    await asyncio.sleep(0.005)  # first batch is now in flight
+    await asyncio.gather(first, batcher.submit("f1", [{"id": 2}]))
+
+    assert max_in_flight == 1
+    assert batcher._flushing == set()
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Fake update-file backend holding one file's revn."""
+
+    backend = SimpleNamespace(revn=7, db_reads=0, sent_revns=[], fail_with=None)
+
+    async def get_file_info(file_id):
+        backend.db_reads += 1
+        return {"revn": backend.revn, "vern": 0, "features": []}
+
+    async def update_file(*, file_id, session_id, revn, vern, changes, features):
+        backend.sent_revns.append(revn)
+        if backend.fail_with:
+            raise _rpc_error(backend.fail_with)
+        if revn > backend.revn:
+            raise _rpc_error("revn-conflict")
+        backend.revn += 1
+        return {"revn": backend.revn, "lagged": []}
+
+    monkeypatch.setattr(changes, "get_file_info", get_file_info)
+    monkeypatch.setattr(changes, "api", SimpleNamespace(update_file=update_file))
+    changes._file_info_cache.clear()
+    yield backend
+    changes._file_info_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_reuses_revn_from_response(backend):
+    await changes.apply_changes("f1", [{"id": 1}])
+    await changes.apply_changes("f1", [{"id": 2}])
+
+    assert backend.db_reads == 1
+    assert backend.sent_revns == [7, 8]
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_retries_revision_conflict_once(backend):
+    await changes.apply_changes("f1", [{"id": 1}])
+    backend.revn = 3  # file restored elsewhere; cached revn 8 is now ahead
+
+    await changes.apply_changes("f1", [{"id": 2}])
+
+    assert backend.sent_revns == [7, 8, 3]
+    assert backend.db_reads == 2
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_does_not_retry_validation_errors(backend):
+    await changes.apply_changes("f1", [{"id": 1}])
+    backend.fail_with = "schema-validation"
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await changes.apply_changes("f1", [{"id": 2}])
+
+    assert backend.sent_revns == [7, 8]
+    assert changes._file_info_cache.get("f1") is None
+
+
+def test_shape_geometry_is_not_shared_between_shapes():
+    a = changes.build_shape_geometry(0, 0, 10, 10)
+    b = changes.build_shape_geometry(0, 0, 10, 10)
+    assert a["selrect"] is not b["selrect"]
+    assert a["points"] is not b["points"]
+
+    # int and float inputs keep their own types
+    assert type(changes.build_shape_geometry(1.0, 0, 10, 10)["selrect"]["x"]) is float
+    assert type(changes.build_shape_geometry(1, 0, 10, 10)["selrect"]["x"]) is int
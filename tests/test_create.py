@@ -0,0 +1,84 @@
+"""Unit tests for batched shape creation (no live Penpot needed)."""
+
+from __future__ import annotations
+
+import inspect
+
+import pytest
+
+from penpot_mcp.tools import create
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    calls: list[tuple[str, list[dict]]] = []
+
+    async def fake_submit(file_id, changes):
+        calls.append((file_id, changes))
+        return {}
+
+    monkeypatch.setattr(create, "submit_changes", fake_submit)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_create_shapes_sends_one_update_in_order(submitted):
+    result = await create.create_shapes(
+        "file",
+        "page",
+        [
+            {"type": "rect", "x": 10, "y": 20, "name": "A"},
+            {"type": "text", "text": "Hi"},
+            {"type": "path", "segments": [{"command": "M", "x": 0, "y": 0}]},
+        ],
+    )
+
+    assert [r["type"] for r in result] == ["rect", "text", "path"]
+    assert len(submitted) == 1
+    file_id, changes = submitted[0]
+    assert file_id == "file"
+    assert [c["id"] for c in changes] == [r["id"] for r in result]
+    assert all(c["type"] == "add-obj" and c["page-id"] == "page" for c in changes)
+
+
+@pytest.mark.parametrize(
+    "bad_spec",
+    [
+        {"type": "path", "segments": [1, 2]},
+        {"type": "rect", "no_such_arg": 1},
+        {"type": "star"},
+    ],
+)
+@pytest.mark.asyncio
+async def test_create_shapes_invalid_spec_sends_nothing(submitted, bad_spec):
+    with pytest.raises(ValueError, match=r"shapes\[1\]"):
+        await create.create_shapes("file", "page", [{"type": "rect"}, bad_spec])
+    assert submitted == []
+
+
+@pytest.mark.asyncio
+async def test_single_create_matches_builder(submitted):
+    result = await create.create_rectangle("file", "page", width=40, name="R")
+
+    assert result["type"] == "rect" and result["name"] == "R"
+    [(file_id, [change])] = submitted
+    assert file_id == "file"
+    assert change["obj"]["width"] == 40
+    assert change["id"] == result["id"]
+
+
+@pytest.mark.parametrize(
+    ("tool", "builder"),
+    [
+        (create.create_rectangle, create._build_rectangle),
+        (create.create_frame, create._build_frame),
+        (create.create_ellipse, create._build_ellipse),
+        (create.create_text, create._build_text),
+        (create.create_path, create._build_path),
+        (create.create_group, create._build_group),
+    ],
+)
+def test_create_tools_match_builder_signatures(tool, builder):
+    tool_params = dict(inspect.signature(tool).parameters)
+    del tool_params["file_id"]
+    assert tool_params == dict(inspect.signature(builder).parameters)
@@ -0,0 +1,231 @@
+"""Unit tests for server-side encoding, caching and plugin serving (no live Penpot needed)."""
+
+from __future__ import annotations
+
+import inspect
+from decimal import Decimal
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.types import TextContent
+from starlette.testclient import TestClient
+
+from penpot_mcp import server
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (Decimal("12.30"), "12.30"),
+        (Decimal(2**64), str(2**64)),
+        (Decimal("NaN"), "NaN"),
+        (b"\x00\x01", "<binary 2 bytes>"),
+        (memoryview(b"abc"), "<binary 3 bytes>"),
+    ],
+)
+def test_db_values_keep_their_string_form(value, expected):
+    # Same output query_database gave when it converted rows itself
+    assert orjson.loads(server._dumps({"v": value})) == {"v": expected}
+
+
+# ── Response caching in _wrap_tool ───────────────────────────
+
+
+@pytest.fixture
+def file_revn(monkeypatch):
+    """Stub the revn lookup made by cache="revn" tools."""
+    revns: dict[str, int] = {"f1": 1}
+
+    async def fetchval(query, file_id):
+        return revns.get(file_id)
+
+    monkeypatch.setattr(server, "db", SimpleNamespace(fetchval=fetchval))
+    server._file_cache.clear()
+    server._meta_cache.clear()
+    yield revns
+    server._file_cache.clear()
+    server._meta_cache.clear()
+
+
+def _counting_tool():
+    calls = []
+
+    async def read_file(file_id: str, flag: bool = False) -> dict:
+        """Read something from a file."""
+        calls.append((file_id, flag))
+        return {"file_id": file_id, "n": len(calls)}
+
+    return read_file, calls
+
+
+@pytest.mark.asyncio
+async def test_revn_cache_hits_until_revn_changes(file_revn):
+    fn, calls = _counting_tool()
+    tool = server._wrap_tool(fn, cache="revn")
+
+    first = await tool("f1")
+    assert await tool("f1") == first
+    assert await tool(file_id="f1", flag=False) == first  # same bound args
+    assert len(calls) == 1
+
+    await tool("f1", True)
+    assert len(calls) == 2
+
+    file_revn["f1"] = 2
+    assert orjson.loads(await tool("f1"))["n"] == 3
+
+
+@pytest.mark.asyncio
+async def test_revn_cache_skips_unknown_files(file_revn, monkeypatch):
+    encoded = []
+    dumps_large = server._dumps_large
+
+    async def spy(obj):
+        encoded.append(obj)
+        return await dumps_large(obj)
+
+    monkeypatch.setattr(server, "_dumps_large", spy)
+    fn, calls = _counting_tool()
+    tool = server._wrap_tool(fn, cache="revn")
+
+    await tool("missing")
+    await tool("missing")
+    assert len(calls) == 2
+    # Uncached results still take the off-loop path for big payloads
+    assert len(encoded) == 2
+
+
+@pytest.mark.asyncio
+async def test_write_tools_clear_ttl_cache(file_revn):
+    fn, calls = _counting_tool()
+    read = server._wrap_tool(fn, cache="ttl")
+
+    async def write_file(file_id: str) -> dict:
+        """Change a file."""
+        return {"ok": True}
+
+    write = server._wrap_tool(write_file, invalidates=True)
+
+    await read("f1")
+    await read("f1")
+    assert len(calls) == 1
+    await write("f1")
+    await read("f1")
+    assert len(calls) == 2
+
+
+def test_wrapped_tool_keeps_schema():
+    fn, _ = _counting_tool()
+    tool = server._wrap_tool(fn, cache="revn")
+    assert tool.__name__ == "read_file"
+    assert tool.__doc__ == fn.__doc__
+    assert list(inspect.signature(tool).parameters) == ["file_id", "flag"]
+    assert inspect.signature(tool).return_annotation is str
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "create_rectangle",
+        "move_shape",
+        "set_text_content",
+        "reply_to_comment",
+        "resolve_comment",
+    ],
+)
+def test_write_tools_invalidate_metadata_cache(name):
+    # Writes change counts in cached file summaries without always bumping revn
+    source = inspect.getsource(server)
+    line = next(ln for ln in source.splitlines() if ln.startswith(f"{name} ="))
+    assert "invalidates=True" in line
+
+
+# ── batch ────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_batch_returns_results_in_order(monkeypatch):
+    async def call_tool(name, args):
+        if name == "boom":
+            raise ToolError("Error executing tool boom: nope")
+        return [
+            TextContent(type="text", text=orjson.dumps({"tool": name, **args}).decode())
+        ]
+
+    monkeypatch.setattr(server.mcp, "call_tool", call_tool)
+    out = orjson.loads(
+        await server.batch(
+            [
+                {"name": "a", "args": {"x": 1}},
+                {"name": "boom"},
+                {"name": "batch", "args": {"calls": []}},
+                {"args": {}},
+                {"name": "b"},
+            ]
+        )
+    )
+
+    assert out[0] == {"name": "a", "result": {"tool": "a", "x": 1}}
+    assert out[1] == {"name": "boom", "error": "Error executing tool boom: nope"}
+    assert out[2]["error"] == "batch calls cannot be nested"
+    assert "error" in out[3]
+    assert out[4] == {"name": "b", "result": {"tool": "b"}}
+
+
+# ── Plugin assets and CORS ───────────────────────────────────
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = server.mcp.streamable_http_app()
+    app.add_middleware(server._PluginCORSMiddleware)
+    return TestClient(app)
+
+
+def test_plugin_asset_gzip_etag_and_304(client):
+    asset = server._PLUGIN_ASSETS["plugin.js"]
+    assert asset.gzip_body is not None
+
+    r = client.get("/plugin/plugin.js", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["etag"] == asset.gzip_etag
+    assert r.content == asset.body  # decoded by the client
+
+    r = client.get("/plugin/plugin.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r.headers
+    assert r.headers["etag"] == asset.etag
+    assert r.content == asset.body
+
+    r = client.get(
+        "/plugin/plugin.js",
+        headers={"Accept-Encoding": "identity", "If-None-Match": asset.etag},
+    )
+    assert r.status_code == 304
+    assert r.content == b""
+
+    assert client.get("/plugin/missing.js").status_code == 404
+
+
+def test_plugin_config_etag(client):
+    r = client.get("/plugin/config.json")
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    r = client.get("/plugin/config.json", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+
+def test_cors_only_on_plugin_routes(client):
+    origin = {"Origin": "https://example.com"}
+    r = client.get("/plugin/manifest.json", headers=origin)
+    assert r.headers["access-control-allow-origin"] == "*"
+
+    r = client.options(
+        "/stream/page-objects",
+        headers={**origin, "Access-Control-Request-Method": "GET"},
+    )
+    assert "access-control-allow-origin" not in r.headers
+    r = client.get("/", headers=origin)
+    assert "access-control-allow-origin" not in r.headers